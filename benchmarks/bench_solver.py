@@ -0,0 +1,176 @@
+"""
+Solver benchmark for the Boggle package.
+
+Generates seeded boards with `MyGameManager.new_game`, times the searches
+and dictionary loading, and prints the results as JSON so runs can be
+compared with each other. Run it from the repository root, e.g:
+    python3 benchmarks/bench_solver.py --sizes 4 5 6 --boards 50 -o bench_output.txt
+
+Timings are taken without tracing; peak memory is measured in a separate
+traced pass over the same work so it does not distort the timings.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from py_boggle import __version__
+from py_boggle.my_game_manager import MyGameManager
+from py_boggle.trie_dictionary import TrieDictionary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-w", "--words", type=str, default="words.txt", help="Path to the words file."
+    )
+    parser.add_argument(
+        "-c", "--cubes", type=str, default="tests/cubes.txt",
+        help="Path to the cubes file. Cubes are reused when a board needs more than the file has."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[4, 5, 6, 7, 8], help="Board sizes to benchmark."
+    )
+    parser.add_argument(
+        "--boards", type=int, default=20, help="Boards per size."
+    )
+    parser.add_argument(
+        "--dict-boards", type=int, default=3, help="Boards per size for the slower dictionary-driven search."
+    )
+    parser.add_argument(
+        "--loads", type=int, default=3, help="Number of timed dictionary loads."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=12345, help="Seed for board generation."
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default="", help="Write the JSON report here instead of stdout."
+    )
+    return parser.parse_args()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples`."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float], peak_bytes: int) -> Dict[str, float]:
+    total = sum(samples)
+    return {
+        "count": len(samples),
+        "total_s": total,
+        "per_second": len(samples) / total if total else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+        "peak_kib": peak_bytes / 1024,
+    }
+
+
+def timed(calls: List[Callable[[], object]]) -> List[float]:
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory(calls: List[Callable[[], object]]) -> int:
+    """Largest extra memory allocated by any single call."""
+    peak = 0
+    tracemalloc.start()
+    for call in calls:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return peak
+
+
+def measure(calls: List[Callable[[], object]]) -> Dict[str, float]:
+    return summarize(timed(calls), peak_memory(calls))
+
+
+def tiled_cubes(cubefile: str, count: int) -> str:
+    """Write a cubes file holding at least `count` cubes, repeating the
+    cubes of `cubefile` as needed, and return its path.
+    """
+    with open(cubefile) as infile:
+        cubes = [line.strip() for line in infile if line.strip()]
+    repeats = -(-count // len(cubes))
+    handle, path = tempfile.mkstemp(suffix=".txt", prefix="cubes")
+    with os.fdopen(handle, "w") as outfile:
+        outfile.write("\n".join(cubes * repeats) + "\n")
+    return path
+
+
+def make_games(size: int, count: int, cubefile: str, dictionary: TrieDictionary,
+               rng_seed: int) -> List[MyGameManager]:
+    random.seed(rng_seed)
+    games = []
+    for _ in range(count):
+        game = MyGameManager()
+        game.new_game(size, cubefile, dictionary)
+        games.append(game)
+    return games
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict:
+    def load() -> TrieDictionary:
+        dictionary = TrieDictionary()
+        dictionary.load_dictionary(args.words)
+        return dictionary
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "load_dictionary": measure([load] * args.loads),
+        "sizes": {},
+    }
+    dictionary = load()
+
+    for size in args.sizes:
+        cubefile = tiled_cubes(args.cubes, size * size)
+        try:
+            games = make_games(size, args.boards, cubefile, dictionary, args.seed + size)
+        finally:
+            os.remove(cubefile)
+        solutions = [game.board_driven_search() for game in games]
+        lookups = [
+            (lambda game=game, word=word: game.find_word_in_board(word))
+            for game, words in zip(games, solutions) for word in sorted(words)
+        ]
+        report["sizes"][str(size)] = {
+            "words_per_board": sum(map(len, solutions)) / len(solutions),
+            "board_driven_search": measure([game.board_driven_search for game in games]),
+            "dictionary_driven_search": measure(
+                [game.dictionary_driven_search for game in games[:args.dict_boards]]),
+            "find_word_in_board": measure(lookups) if lookups else None,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    cfg = parse_args()
+    result = json.dumps(run_benchmark(cfg), indent=2)
+    if cfg.output:
+        with open(cfg.output, "w") as outfile:
+            outfile.write(result + "\n")
+    else:
+        print(result)
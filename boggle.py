@@ -10,8 +10,11 @@ the end of the command. e.g:
 """
 
 import argparse
-import math
-from py_boggle import trie_dictionary, my_game_manager
+import asyncio
+import json
+import os
+import sys
+from py_boggle import batch_solver, board_solver, dawg_dictionary, trie_dictionary, my_game_manager, server, solution_cache
 from typing import List, Optional
 
 
@@ -27,42 +30,104 @@ def parse_args() -> argparse.Namespace:
         "-s", "--size", type=str, default=4, help="Size of board."
     )
     parser.add_argument(
-        "-b", "--board", type=str, default="", help="Board given by a string of letters"
+        "-d", "--dictionary", type=str, default="trie", choices=["trie", "dawg"],
+        help="Dictionary structure: a trie, or a compact DAWG that uses far less memory."
+    )
+    parser.add_argument(
+        "--compile", type=str, default="", metavar="OUTFILE",
+        help="Compile the words file into a binary dictionary at OUTFILE and exit."
+    )
+    parser.add_argument(
+        "--batch", type=str, default="", metavar="BOARDS",
+        help="Solve every board in BOARDS (one per line, '-' for stdin) and print JSON lines."
+    )
+    parser.add_argument(
+        "--serve", type=int, default=None, metavar="PORT",
+        help="Host games over line-delimited JSON on PORT instead of playing interactively."
+    )
+    parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Address to listen on with --serve."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for --batch and --serve (default: one per CPU)."
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, default="", help="Directory for keeping board solutions between runs."
+    )
+    parser.add_argument(
+        "--scoring-words-only", action="store_true",
+        help="Load only words that can score on boards rolled from the cubes file, for a faster start."
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=None, metavar="SECONDS",
+        help="Stop the end-of-game search after SECONDS and show the words found so far (for large boards)."
+    )
+    parser.add_argument(
+        "-b", "--board", type=str, default="", help="Board given by a string of letters, or of space-separated tiles such as 'qu i e t ...'"
     )
 
     return parser.parse_args()
 
 
 def run_boggle(args):
-    mydict = trie_dictionary.TrieDictionary()
-    mydict.load_dictionary(args.words)
+    if args.compile:
+        compiled = dawg_dictionary.DawgDictionary()
+        compiled.load_dictionary(args.words)
+        compiled.save(args.compile)
+        print("Compiled dictionary written to", args.compile)
+        return
+    if args.batch:
+        run_batch(args)
+        return
+
+    load_options = (0, None)
+    if args.scoring_words_only:
+        load_options = (my_game_manager.SHORT + 1, my_game_manager.cube_alphabet(args.cubes))
+    mydict = batch_solver.load_dictionary(args.words, *load_options, dawg=args.dictionary == "dawg")
+
+    if args.serve is not None:
+        run_server(args, mydict, load_options)
+        return
 
     mygame = my_game_manager.MyGameManager()
+    # cached solutions are only valid for the same words file, load options and minimum length
+    namespace = solution_cache.dictionary_fingerprint(args.words, load_options, my_game_manager.SHORT)
+    mygame.solution_cache = solution_cache.SolutionCache(directory=args.cache_dir or None, namespace=namespace)
+    if isinstance(mydict, trie_dictionary.TrieDictionary):
+        mygame.solution_cache.watch(mydict)
+    if args.time_limit is not None:
+        mygame.search_budget = board_solver.SearchBudget(max_seconds=args.time_limit)
     if args.board:
-        d = math.sqrt(len(args.board))
-        if not d.is_integer():
+        try:
+            board = batch_solver.parse_board(args.board)
+        except ValueError:
             print("Your custom board is not square. Please try again")
-        else:
-            board = print_board(args.board, d)
+            return
+        print_board(board)
+        d = len(board)
     else:
         d = args.size
     mygame.new_game(int(d), args.cubes, mydict)
     if args.board:
         mygame.set_game(board)
     else:
-        board = print_board(transform_board(mygame.get_board()), mygame.size)
+        board = mygame.get_board()
+        print_board(board)
 
     choice = ''
     word_list = []
     while choice != 'q':
         again = 'neutral'
-        print("Play by typing a word, or type q to quit")
+        print("Play by typing a word, type ? for a hint, or type q to quit")
         choice = input("Type your word (or q to quit): ")
         print()
         if choice == "q":
             print("Your final score: ", mygame.get_score())
 
             all_words = mygame.board_driven_search()
+            if mygame.search_budget is not None and not mygame.search_budget.complete:
+                print("Search stopped after", args.time_limit, "seconds; some words may be missing.")
             comp_words = []
             comp_score = 0
             print("Remaining available words: ")
@@ -87,39 +152,67 @@ def run_boggle(args):
                 if args.board:
                     mygame.set_game(board)
                 else:
-                    board = print_board(transform_board(mygame.get_board()), mygame.size)
+                    board = mygame.get_board()
+                    print_board(board)
+
+        if choice == "?":
+            hints = mygame.hint(1)
+            if hints:
+                print("Hint: the best word left starts with", hints[0][:2].upper(), "and has", len(hints[0]), "letters")
+            else:
+                print("No words left to find.")
+            continue
 
         if again == 'neutral': # We are not quitting the game, add the word
             score = mygame.add_word(choice)
             if score == 0:
                 print("Word not added. Invalid or already guessed.")
                 print("Score: ", mygame.get_score())
-                print_board(transform_board(board), len(board))
+                print_board(board)
             else:
                 word_list.append(choice.upper())
                 print("New score: ", mygame.get_score())
                 word_coords = mygame.get_last_added_word()
-                print_board(transform_board(board), len(board), word_coords)
-
-
-def print_board(my_board, side_len, coords=[[]]):
-    di = int(side_len)
-    board = [[] for i in range(0, di)]
-    r = 0
-    while r < di:
-        for i in range(di):
-            board[r].append(my_board[r*di + i])
-            if (r, i) in coords:
-                print(board[r][i].upper(), end=" ")
-            else:
-                print(board[r][i].lower(), end=" ")
-        print()
-        r += 1
-    return board
-
-
-def transform_board(list_board: List[List[str]]):
-    return ''.join([''.join(list_board[i]) for i in range(0, len(list_board))])
+                print_board(board, word_coords)
+
+
+def run_batch(args):
+    boards = sys.stdin if args.batch == "-" else open(args.batch)
+    with boards:
+        for board, words in batch_solver.solve_boards(boards, args.words, args.workers):
+            score = sum(len(w) - my_game_manager.SHORT for w in words)
+            print(json.dumps({"board": board, "score": score, "words": words}))
+
+
+def run_server(args, mydict, load_options):
+    workers = args.workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool = None
+    if workers > 1:
+        # workers load their own copy, with the same options, so every room
+        # sees the same words however many workers there are; words changed
+        # later in this process do not reach them
+        pool = batch_solver.worker_pool(args.words, workers, *load_options,
+                                        dawg=args.dictionary == "dawg")
+    print(f"Serving on {args.host}:{args.serve}")
+    try:
+        asyncio.run(server.serve(mydict, args.cubes, args.host, args.serve, pool))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def print_board(board: List[List[str]], coords=()):
+    """Print `board` row by row, upper-casing the cells at `coords`.
+    Cells are padded to the widest label, so multi-letter tiles line up.
+    """
+    width = max(len(label) for row in board for label in row)
+    for r, row in enumerate(board):
+        labels = [label.upper() if (r, c) in coords else label.lower() for c, label in enumerate(row)]
+        print(" ".join(label.ljust(width) for label in labels).rstrip())
 
 
 if __name__ == "__main__":
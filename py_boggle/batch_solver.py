@@ -0,0 +1,156 @@
+"""
+This module solves many boards at once across a pool of worker processes.
+
+Boards are written the same way as the `--board` option of `boggle.py`:
+one string of `size * size` letters in row-major order. Boards with
+multi-letter tiles separate every label with spaces instead, as in
+`qu i e t e t x z p i z z z z z z`. Each worker loads
+the dictionary once when it starts. Passing a compiled dictionary (see
+`DawgDictionary.save`) makes that load a memory map, so all workers share
+one copy of the dictionary in memory.
+"""
+
+import math
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from py_boggle import dawg_dictionary
+from py_boggle.board_solver import BoardSolver
+from py_boggle.boggle_dictionary import BoggleDictionary
+from py_boggle.my_game_manager import SHORT
+from py_boggle.trie_dictionary import TrieDictionary
+
+# the dictionary used by this process when it is a pool worker
+_worker_dictionary: Optional[BoggleDictionary] = None
+
+
+def load_dictionary(words_file: str, min_length: int = 0, alphabet: Optional[str] = None,
+                    dawg: bool = False) -> BoggleDictionary:
+    """Load `words_file` as a DAWG if `dawg` is set or the file is
+    compiled (a memory map, then), or as a `TrieDictionary` otherwise.
+    `min_length` and `alphabet` are passed to `load_dictionary`.
+    """
+    if dawg or dawg_dictionary.is_compiled(words_file):
+        dictionary = dawg_dictionary.DawgDictionary()
+    else:
+        dictionary = TrieDictionary()
+    dictionary.load_dictionary(words_file, min_length, alphabet)
+    return dictionary
+
+
+def parse_board(letters: str) -> List[List[str]]:
+    """Turn a row-major string of letters, or of space-separated labels,
+    into a square board.
+
+    Raises:
+        ValueError: The number of cells is not a perfect square.
+    """
+    letters = letters.strip().lower()
+    labels = letters.split() if any(c.isspace() for c in letters) else list(letters)
+    size = math.isqrt(len(labels))
+    if size == 0 or size * size != len(labels):
+        raise ValueError(f"board {letters!r} is not square")
+    return [labels[r * size:(r + 1) * size] for r in range(size)]
+
+
+def solve_board(letters: str, dictionary: BoggleDictionary) -> List[str]:
+    """Return the sorted list of scoring words on the board `letters`."""
+    return sorted(BoardSolver(parse_board(letters), dictionary).solve(SHORT + 1))
+
+
+def solve_board_paths(board: List[List[str]], dictionary: BoggleDictionary) -> Dict[str, List[int]]:
+    """Return the word-path index of `board`, as `BoardSolver.solve_paths`."""
+    return BoardSolver(board, dictionary).solve_paths(SHORT + 1)
+
+
+def _init_worker(words_file: str, min_length: int = 0, alphabet: Optional[str] = None,
+                 dawg: bool = False) -> None:
+    global _worker_dictionary
+    _worker_dictionary = load_dictionary(words_file, min_length, alphabet, dawg)
+
+
+def solve_board_paths_in_worker(board: List[List[str]]) -> Dict[str, List[int]]:
+    """`solve_board_paths` against the dictionary of a pool worker started
+    with `worker_pool`.
+    """
+    return solve_board_paths(board, _worker_dictionary)
+
+
+def worker_pool(words_file: str, workers: int, min_length: int = 0,
+                alphabet: Optional[str] = None, dawg: bool = False) -> ProcessPoolExecutor:
+    """Return a process pool whose workers each load `words_file` once,
+    with the options of `load_dictionary`.
+
+    Each worker has its own copy of the words, so words later inserted
+    into or deleted from a dictionary in this process are not seen there.
+    """
+    return ProcessPoolExecutor(workers, initializer=_init_worker,
+                               initargs=(words_file, min_length, alphabet, dawg))
+
+
+def _solve_chunk(chunk: List[str]) -> List[List[str]]:
+    return [solve_board(letters, _worker_dictionary) for letters in chunk]
+
+
+def _chunks(boards: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for letters in boards:
+        letters = letters.strip()
+        if not letters:
+            continue
+        chunk.append(letters)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_boards(boards: Iterable[str], words_file: str, workers: Optional[int] = None,
+                 chunksize: int = 32) -> Iterator[Tuple[str, List[str]]]:
+    """Solve every board in `boards`, yielding `(board, words)` pairs in
+    input order as soon as they are ready.
+
+    `boards` is consumed lazily, with only a bounded number of chunks in
+    flight, so it can be a file or another unbounded stream. Blank lines
+    are skipped.
+
+    Args:
+        boards: Row-major board strings, one per item.
+        words_file: The dictionary file each worker loads.
+        workers: Number of worker processes. Defaults to one per CPU; 1 or
+            less solves in this process instead.
+        chunksize: Number of boards sent to a worker per task.
+
+    Raises:
+        ValueError: A board is not square.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        dictionary = load_dictionary(words_file)
+        for chunk in _chunks(boards, chunksize):
+            for letters in chunk:
+                yield letters, solve_board(letters, dictionary)
+        return
+
+    with worker_pool(words_file, workers) as pool:
+        yield from _ordered_results(pool, _chunks(boards, chunksize), 2 * workers)
+
+
+def _ordered_results(pool: Executor, chunks: Iterator[List[str]],
+                     window: int) -> Iterator[Tuple[str, List[str]]]:
+    pending: Deque[Tuple[List[str], Future]] = deque()
+    for chunk in chunks:
+        pending.append((chunk, pool.submit(_solve_chunk, chunk)))
+        if len(pending) >= window:
+            yield from _drain_one(pending)
+    while pending:
+        yield from _drain_one(pending)
+
+
+def _drain_one(pending: Deque[Tuple[List[str], Future]]) -> Iterator[Tuple[str, List[str]]]:
+    chunk, future = pending.popleft()
+    yield from zip(chunk, future.result())
@@ -0,0 +1,166 @@
+"""
+This module generates boards in bulk with NumPy.
+
+A cube set is loaded once into a `(cubes, sides)` array of faces. Each batch
+shuffles the cubes and picks a face of every cube with array operations, so
+thousands of boards come out of one call instead of one Python loop per
+board. NumPy is only needed by this module; the rest of the package does
+not depend on it.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from py_boggle.board_solver import BoardSolution, BoardSolver
+from py_boggle.boggle_dictionary import BoggleDictionary
+from py_boggle.my_game_manager import SHORT, load_cubes
+
+VOWELS = "aeiou"
+
+
+class BoardGenerator:
+    """Generates random boards from one cube set.
+
+    Args:
+        cubefile: Name of a file containing the cubes, as for `new_game`.
+        seed: Seed for the generator's random numbers. Generators built with
+            the same seed and cube file produce the same boards.
+
+    Raises:
+        OSError: The `cubefile` cannot be opened or read.
+    """
+
+    def __init__(self, cubefile: str, seed: Optional[int] = None):
+        cubes = load_cubes(cubefile)
+        width = max((len(face) for cube in cubes for face in cube), default=1)
+        self.faces = np.array([list(cube) for cube in cubes], dtype=f"<U{width}")
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, size: int, count: int) -> np.ndarray:
+        """Return `count` random `size` x `size` boards as an array of shape
+        `(count, size, size)`.
+
+        Each board uses distinct cubes in a random order, each showing a
+        random face, like `MyGameManager.new_game`.
+
+        Raises:
+            ValueError: `size` is below 2 or there are too few cubes.
+        """
+        order, shown = self._draw(size, count)
+        return self.faces[order, shown].reshape(count, size, size)
+
+    def _draw(self, size: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        # the cube at each cell of each board, and the side it shows
+        cells = size * size
+        cubes, sides = self.faces.shape
+        if size < 2 or cubes < cells:
+            raise ValueError('ERROR: Invalid Dimensions (size, cubes)')
+        # sorting random keys gives an independent permutation per board
+        order = np.argsort(self.rng.random((count, cubes)), axis=1)[:, :cells]
+        shown = self.rng.integers(0, sides, size=(count, cells))
+        return order, shown
+
+    def boards(self, size: int, count: int) -> List[List[List[str]]]:
+        """`generate`, as nested lists ready for `MyGameManager.set_game`."""
+        return self.generate(size, count).tolist()
+
+    def generate_targeted(self, size: int, dictionary: BoggleDictionary, min_words: int = 0,
+                          max_words: Optional[int] = None, min_score: int = 0, min_longest: int = 0,
+                          batch: int = 64, rounds: int = 4, steps: int = 400) -> Optional[List[List[str]]]:
+        """Return a random board meeting the given constraints, or None if
+        none was found within the search budget.
+
+        Each round draws a batch of boards and solves them, keeping the
+        first that meets the constraints. Otherwise the closest board is
+        improved by local search: one cell at a time is switched to another
+        face of its cube, or to an unused cube, and the change is kept
+        unless it moves the board further from the constraints. Only paths
+        through the changed cell are searched again after each step.
+
+        Args:
+            size: The size of the board.
+            dictionary: The dictionary to score boards with.
+            min_words: Fewest scoring words allowed.
+            max_words: Most scoring words allowed, or None for no limit.
+            min_score: Lowest total score allowed, over every scoring word.
+            min_longest: Length the longest word must reach.
+            batch: Boards drawn per round.
+            rounds: Number of rounds.
+            steps: Local search steps per round.
+
+        Raises:
+            ValueError: `size` is below 2 or there are too few cubes.
+        """
+        def shortfall(words) -> int:
+            # how far a word set is from meeting every constraint; 0 if it does
+            count = len(words)
+            score = sum(len(word) - SHORT for word in words)
+            longest = max(map(len, words), default=0)
+            return (max(0, min_words - count) + max(0, min_score - score)
+                    + (0 if max_words is None else max(0, count - max_words))
+                    + SHORT * max(0, min_longest - longest))
+
+        for _ in range(rounds):
+            order, shown = self._draw(size, batch)
+            best = None
+            for index in range(batch):
+                board = self.faces[order[index], shown[index]].reshape(size, size).tolist()
+                miss = shortfall(BoardSolver(board, dictionary).solve(SHORT + 1))
+                if miss == 0:
+                    return board
+                if best is None or miss < best[0]:
+                    best = (miss, index, board)
+            miss, index, board = best
+            board = self._improve(board, [int(cube) for cube in order[index]], dictionary, shortfall, miss, steps)
+            if board is not None:
+                return board
+        return None
+
+    def _improve(self, board: List[List[str]], cube_at: List[int], dictionary: BoggleDictionary,
+                 shortfall, miss: int, steps: int) -> Optional[List[List[str]]]:
+        solution = BoardSolution(board, dictionary, SHORT + 1)
+        words = solution.words()
+        cubes, sides = self.faces.shape
+        on_board = set(cube_at)
+        unused = [cube for cube in range(cubes) if cube not in on_board]
+        for _ in range(steps):
+            cell = int(self.rng.integers(len(cube_at)))
+            old_cube = cube_at[cell]
+            swap = None
+            if unused and self.rng.random() < 0.5:
+                swap = int(self.rng.integers(len(unused)))
+                cube_at[cell], unused[swap] = unused[swap], cube_at[cell]
+            label = str(self.faces[cube_at[cell], int(self.rng.integers(sides))])
+            gained, lost = solution.change_cell(cell, label)
+            candidate = (words - lost) | gained
+            candidate_miss = shortfall(candidate)
+            if candidate_miss == 0:
+                return solution.board()
+            if candidate_miss <= miss:
+                words, miss = candidate, candidate_miss
+                continue
+            solution.undo_change()
+            if swap is not None:
+                unused[swap] = cube_at[cell]
+                cube_at[cell] = old_cube
+        return None
+
+
+def letter_counts(boards: np.ndarray) -> np.ndarray:
+    """Return a `(count, 26)` array of how many faces of each board start
+    with each letter `a` to `z`.
+    """
+    count = boards.shape[0]
+    first = np.ascontiguousarray(boards.reshape(count, -1).astype("<U1"))
+    codes = first.view(np.uint32) - ord("a")
+    rows = np.broadcast_to(np.arange(count)[:, None], codes.shape)
+    valid = codes < 26
+    counts = np.zeros((count, 26), dtype=np.int64)
+    np.add.at(counts, (rows[valid], codes[valid]), 1)
+    return counts
+
+
+def vowel_counts(boards: np.ndarray) -> np.ndarray:
+    """Return how many faces of each board start with a vowel."""
+    return letter_counts(boards)[:, [ord(v) - ord("a") for v in VOWELS]].sum(axis=1)
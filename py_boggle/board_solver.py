@@ -0,0 +1,846 @@
+"""
+This module contains the board search engine used by `MyGameManager`.
+
+The board is flattened into a row-major list of cells, so cell `i` sits at
+row `i // size` and column `i % size`. A cell's label may hold several
+letters (such as the "qu" face), and every search steps through the
+dictionary by the whole label at once. Adjacency comes from a table that is
+computed once per board size, and the cells used by the current path are
+tracked in an integer bitmask, so backtracking never copies anything.
+"""
+
+import heapq
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from py_boggle.boggle_dictionary import BoggleDictionary, letter_bit
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Return, for each cell of a `size` x `size` board, the indices of
+    its adjacent cells.
+
+    Neighbors are listed in the same order the original nested
+    `(dx, dy)` loops visited them, so searches return the same paths.
+    """
+    table = []
+    for x in range(size):
+        for y in range(size):
+            adjacent = []
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    nx, ny = x + dx, y + dy
+                    if (dx or dy) and 0 <= nx < size and 0 <= ny < size:
+                        adjacent.append(nx * size + ny)
+            table.append(tuple(adjacent))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def distance_table(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Return the number of king moves between every pair of cells of a
+    `size` x `size` board, i.e. the fewest steps a path needs between them.
+    """
+    return tuple(
+        tuple(max(abs(a // size - b // size), abs(a % size - b % size)) for b in range(size * size))
+        for a in range(size * size)
+    )
+
+
+class SolveStats:
+    """Counters describing one board solve.
+
+    Pass an instance to `BoardSolver.solve` to have it filled in. Solves
+    without one run a separate search that does no counting at all.
+    """
+
+    def __init__(self):
+        self.trie_lookups = 0 # dictionary steps attempted, one per tile
+        self.nodes_visited = 0 # steps that landed on a valid prefix
+        self.prefix_rejections = 0 # steps that left every dictionary prefix
+        self.pruned = 0 # steps into subtrees whose words were all found already
+        self.max_depth = 0 # most tiles on any path explored
+        self.words_found = 0 # distinct words reported by the solve
+        self.cell_seconds: List[float] = [] # time spent on paths starting at each cell
+
+    def slowest_cells(self, count: int = 1) -> List[int]:
+        """Return the `count` starting cells that took longest, slowest first."""
+        order = sorted(range(len(self.cell_seconds)), key=self.cell_seconds.__getitem__, reverse=True)
+        return order[:count]
+
+    def as_dict(self) -> Dict[str, object]:
+        return dict(vars(self))
+
+
+class SearchBudget:
+    """Limits on one `BoardSolver.solve_bounded` or `top_words` call, and
+    what it used.
+
+    A solve that runs out of budget stops early and returns the words it
+    found so far, with `complete` left False. An instance can be passed to
+    any number of solves; each one starts its own count.
+    """
+
+    def __init__(self, max_seconds: Optional[float] = None, max_nodes: Optional[int] = None):
+        self.max_seconds = max_seconds # wall-clock limit, or None for no limit
+        self.max_nodes = max_nodes # limit on dictionary steps, or None for no limit
+        self.nodes = 0 # dictionary steps taken by the last solve
+        self.seconds = 0.0 # time taken by the last solve
+        self.complete = False # whether the last solve explored every path
+
+
+class _BudgetSpent(Exception):
+    """Unwinds a recursive search whose `SearchBudget` ran out."""
+
+
+class BoardSolver:
+    """Searches one board against one dictionary.
+
+    Construct a new solver whenever the board changes; the solver holds
+    no other state between calls.
+    """
+
+    def __init__(self, board: List[List[str]], dictionary: BoggleDictionary):
+        self.size: int = len(board)
+        self.cells: List[str] = [cell for row in board for cell in row]
+        self.neighbors = neighbor_table(self.size)
+        self.dictionary = dictionary
+
+    def coords(self, cells: List[int]) -> List[Tuple[int, int]]:
+        """Convert a list of cell indices to `(row, column)` pairs."""
+        return [divmod(cell, self.size) for cell in cells]
+
+    def find_word(self, word: str) -> Optional[List[Tuple[int, int]]]:
+        """Return the coordinates of the first path spelling `word`, or
+        None if `word` is not on the board.
+
+        `word` must already be lowercase.
+        """
+        path = self.find_path(word)
+        return None if path is None else self.coords(path)
+
+    def find_path(self, word: str) -> Optional[List[int]]:
+        """Like `find_word`, but return the path as cell indices."""
+        if not word:
+            return None
+        cells = self.cells
+        neighbors = self.neighbors
+        length = len(word)
+        path: List[int] = []
+
+        def dfs(cell: int, index: int, visited: int) -> bool:
+            # a cell matches when its whole label comes next in `word`
+            if not word.startswith(cells[cell], index):
+                return False
+            path.append(cell)
+            index += len(cells[cell])
+            if index == length:
+                return True
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1 and dfs(nxt, index, visited):
+                    return True
+            path.pop()
+            return False
+
+        for start in range(len(cells)):
+            if dfs(start, 0, 0):
+                return path
+        return None
+
+    def find_all_paths(self, word: str) -> List[List[int]]:
+        """Return every distinct path spelling `word`, as cell indices, in
+        the order `solve_all_paths` finds them. Only paths spelling `word`
+        are explored.
+
+        `word` must already be lowercase.
+        """
+        paths: List[List[int]] = []
+        if not word:
+            return paths
+        cells = self.cells
+        neighbors = self.neighbors
+        length = len(word)
+        path: List[int] = []
+
+        def dfs(cell: int, index: int, visited: int) -> None:
+            if not word.startswith(cells[cell], index):
+                return
+            path.append(cell)
+            index += len(cells[cell])
+            if index == length:
+                paths.append(path[:])
+            else:
+                visited |= 1 << cell
+                for nxt in neighbors[cell]:
+                    if not visited >> nxt & 1:
+                        dfs(nxt, index, visited)
+            path.pop()
+
+        for start in range(len(cells)):
+            dfs(start, 0, 0)
+        return paths
+
+    def solve(self, min_length: int = 1, prune: bool = False,
+              stats: Optional[SolveStats] = None) -> Set[str]:
+        """Return every dictionary word of at least `min_length` letters
+        that can be traced on the board.
+
+        With `prune`, and a dictionary that provides a `solve_tracker`, the
+        search stops descending into subtrees whose words have all been
+        found already. With `stats`, the solve records its counters there.
+        """
+        tracker = self.dictionary.solve_tracker() if prune else None
+        if stats is not None:
+            return self._solve_instrumented(min_length, tracker, stats)
+        if tracker is not None:
+            return self._solve_pruned(min_length, tracker)
+        found: Set[str] = set()
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            if len(word) >= min_length and at_word(node):
+                found.add(word)
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return found
+
+    def solve_bounded(self, min_length: int = 1, max_length: Optional[int] = None,
+                      budget: Optional[SearchBudget] = None) -> Set[str]:
+        """Like `solve`, for large boards: the search runs on an explicit
+        stack, stops extending words at `max_length` letters, and gives up
+        when `budget` runs out.
+
+        `max_length` defaults to the dictionary's longest word, when the
+        dictionary reports `height`. Words found before the budget ran out
+        are returned either way; check `budget.complete` to tell whether
+        the result is the full solution.
+        """
+        root = self.dictionary.cursor()
+        if max_length is None:
+            max_length = self.dictionary.height(root)
+        if max_length is None:
+            max_length = sum(len(label) for label in self.cells)
+        max_nodes = -1 if budget is None or budget.max_nodes is None else budget.max_nodes
+        deadline = None
+        started = time.perf_counter()
+        if budget is not None and budget.max_seconds is not None:
+            deadline = started + budget.max_seconds
+
+        found: Set[str] = set()
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        nodes = 0
+        complete = True
+        # each entry is a cell still to be stepped onto, with the state of
+        # the path leading up to it
+        stack = [(start, root, "", 0) for start in range(len(cells) - 1, -1, -1)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            if nodes == max_nodes or (deadline is not None and not nodes & 1023
+                                      and time.perf_counter() > deadline):
+                complete = False
+                break
+            cell, node, word, visited = pop()
+            nodes += 1
+            node = advance(node, cells[cell])
+            if node is None:
+                continue
+            word += cells[cell]
+            if len(word) >= min_length and at_word(node):
+                found.add(word)
+            if len(word) >= max_length:
+                continue
+            visited |= 1 << cell
+            for nxt in reversed(neighbors[cell]):
+                if not visited >> nxt & 1:
+                    push((nxt, node, word, visited))
+
+        if budget is not None:
+            budget.nodes = nodes
+            budget.seconds = time.perf_counter() - started
+            budget.complete = complete
+        return found
+
+    def solve_lists(self, min_length: int = 1) -> Dict[str, int]:
+        """Return a map from every word of at least `min_length` letters on
+        the board to the bits of the word lists holding it, in one search
+        for all lists.
+
+        The dictionary must provide `word_lists(cursor)`, as
+        `MultiDictionary` does.
+        """
+        found: Dict[str, int] = {}
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        word_lists = self.dictionary.word_lists
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            if len(word) >= min_length:
+                lists = word_lists(node)
+                if lists:
+                    found[word] = lists
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return found
+
+    def solve_paths(self, min_length: int = 1) -> Dict[str, List[int]]:
+        """Return a map from every dictionary word of at least `min_length`
+        letters on the board to the cells of a path spelling it.
+
+        Each word's path is the one `find_word` would return.
+        """
+        paths: Dict[str, List[int]] = {}
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        path: List[int] = []
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            path.append(cell)
+            if len(word) >= min_length and word not in paths and at_word(node):
+                paths[word] = path[:]
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+            path.pop()
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return paths
+
+    def solve_all_paths(self, min_length: int = 1) -> Dict[str, List[bytes]]:
+        """Return a map from every dictionary word of at least `min_length`
+        letters on the board to every distinct path spelling it, in search
+        order.
+
+        Paths are packed as bytes, one byte per cell on boards of up to 256
+        cells and two little-endian bytes per cell beyond that; see
+        `decode_path`.
+        """
+        paths: Dict[str, List[bytes]] = {}
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        width = self.path_width()
+        codes = [cell.to_bytes(width, "little") for cell in range(len(cells))]
+        trail = bytearray()
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            trail.extend(codes[cell])
+            if len(word) >= min_length and at_word(node):
+                paths.setdefault(word, []).append(bytes(trail))
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+            del trail[-width:]
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return paths
+
+    def solve_path_counts(self, min_length: int = 1) -> Counter:
+        """Return the number of distinct paths spelling every dictionary
+        word of at least `min_length` letters on the board, without
+        keeping the paths.
+        """
+        counts: Counter = Counter()
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            if len(word) >= min_length and at_word(node):
+                counts[word] += 1
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return counts
+
+    def path_width(self) -> int:
+        """Return the number of bytes per cell in packed paths."""
+        return 1 if len(self.cells) <= 256 else 2
+
+    def decode_path(self, packed: bytes) -> List[int]:
+        """Unpack a path from `solve_all_paths` into cell indices."""
+        if self.path_width() == 1:
+            return list(packed)
+        return [packed[i] | packed[i + 1] << 8 for i in range(0, len(packed), 2)]
+
+    def solve_masks(self, min_length: int = 1) -> Dict[str, Set[int]]:
+        """Return a map from every dictionary word of at least `min_length`
+        letters on the board to the cell bitmasks of all paths spelling it.
+        """
+        return self._collect_masks(min_length, None)
+
+    def solve_through(self, cell: int, min_length: int = 1) -> Dict[str, Set[int]]:
+        """Like `solve_masks`, but only for paths that use `cell`.
+
+        Paths that have not reached `cell` yet are abandoned as soon as the
+        dictionary's `height` shows the word cannot get long enough to reach
+        it, or its `letters_below` shows the word cannot continue with the
+        letter on `cell`.
+        """
+        return self._collect_masks(min_length, cell)
+
+    def _collect_masks(self, min_length: int, through: Optional[int]) -> Dict[str, Set[int]]:
+        masks: Dict[str, Set[int]] = {}
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        height = self.dictionary.height
+        letters_below = self.dictionary.letters_below
+        if through is not None:
+            distances = distance_table(self.size)[through]
+            needed = letter_bit(cells[through][0])
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            # every path from here on already uses `through`, if one is required
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            visited |= 1 << cell
+            word += cells[cell]
+            if len(word) >= min_length and at_word(node):
+                masks.setdefault(word, set()).add(visited)
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+
+        def dfs_toward(cell: int, node, word: str, visited: int) -> None:
+            # paths that have not reached `through` yet
+            if cell == through:
+                dfs(cell, node, word, visited)
+                return
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            remaining = height(node)
+            if remaining is not None and remaining < distances[cell]:
+                return
+            below = letters_below(node)
+            if below is not None and not below & needed:
+                return
+            visited |= 1 << cell
+            word += cells[cell]
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs_toward(nxt, node, word, visited)
+
+        root = self.dictionary.cursor()
+        search = dfs if through is None else dfs_toward
+        for start in range(len(cells)):
+            search(start, root, "", 0)
+        return masks
+
+    def top_words(self, count: int, min_length: int = 1, exclude: Iterable[str] = (),
+                  budget: Optional[SearchBudget] = None) -> List[str]:
+        """Return up to `count` of the longest, and so highest-scoring,
+        dictionary words of at least `min_length` letters on the board,
+        longest first and alphabetically among equal lengths. Words in
+        `exclude` are skipped.
+
+        The search keeps the lengths of the best words found so far and,
+        using the dictionary's `height`, abandons every path whose words
+        could not be longer than the shortest of them. With `budget`, it
+        stops early as `solve_bounded` does and returns the best words
+        found so far.
+        """
+        if count <= 0:
+            return []
+        max_nodes = -1 if budget is None or budget.max_nodes is None else budget.max_nodes
+        deadline = None
+        started = time.perf_counter()
+        if budget is not None and budget.max_seconds is not None:
+            deadline = started + budget.max_seconds
+        nodes = 0
+        exclude = set(exclude)
+        found: Set[str] = set()
+        best: List[int] = [] # min-heap of the lengths of the `count` longest words found
+        floor = 0 # length a word needs to make the list, once `best` is full
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        height = self.dictionary.height
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            nonlocal floor, nodes
+            if nodes == max_nodes or (deadline is not None and not nodes & 1023
+                                      and time.perf_counter() > deadline):
+                raise _BudgetSpent
+            nodes += 1
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            if len(word) < floor:
+                remaining = height(node)
+                if remaining is not None and len(word) + remaining < floor:
+                    return
+            if (len(word) >= min_length and word not in found and word not in exclude
+                    and at_word(node)):
+                found.add(word)
+                if len(best) < count:
+                    heapq.heappush(best, len(word))
+                elif len(word) > best[0]:
+                    heapq.heapreplace(best, len(word))
+                if len(best) == count:
+                    floor = best[0]
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+
+        root = self.dictionary.cursor()
+        complete = True
+        try:
+            for start in range(len(cells)):
+                dfs(start, root, "", 0)
+        except _BudgetSpent:
+            complete = False
+        if budget is not None:
+            budget.nodes = nodes
+            budget.seconds = time.perf_counter() - started
+            budget.complete = complete
+        return sorted(found, key=lambda word: (-len(word), word))[:count]
+
+    def longest_word(self, min_length: int = 1) -> Optional[str]:
+        """Return the first of `top_words(1, min_length)`, or None if the
+        board has no words that long.
+        """
+        words = self.top_words(1, min_length)
+        return words[0] if words else None
+
+    def solve_matching(self, prefix: str = "", suffix: str = "", min_length: int = 1) -> Set[str]:
+        """Return every dictionary word of at least `min_length` letters on
+        the board that starts with `prefix` and ends with `suffix`.
+
+        Paths stop as soon as they leave `prefix`, and, when the
+        dictionary provides `letters_below`, as soon as the last letter of
+        `suffix` appears nowhere below them. That letter may still appear
+        mid-word, so this only rules paths out; the suffix itself is
+        checked at each word.
+        """
+        prefix = prefix.lower()
+        suffix = suffix.lower()
+        min_length = max(min_length, len(prefix), len(suffix))
+        last = letter_bit(suffix[-1]) if suffix else 0
+        found: Set[str] = set()
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        letters_below = self.dictionary.letters_below
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None:
+                return
+            word += cells[cell]
+            if len(word) < len(prefix):
+                if not prefix.startswith(word):
+                    return
+            elif not word.startswith(prefix):
+                return
+            if len(word) >= min_length and word.endswith(suffix) and at_word(node):
+                found.add(word)
+            if last:
+                below = letters_below(node)
+                if below is not None and not below & last:
+                    return
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return found
+
+    def letter_counts(self) -> Counter:
+        """Return how many times each letter appears on the board."""
+        return Counter(letter for label in self.cells for letter in label)
+
+    def adjacent_bigrams(self) -> Set[str]:
+        """Return every two-letter string that some path on the board spells."""
+        cells = self.cells
+        bigrams = set()
+        for cell, label in enumerate(cells):
+            for i in range(len(label) - 1):
+                bigrams.add(label[i:i + 2])
+            for nxt in self.neighbors[cell]:
+                bigrams.add(label[-1] + cells[nxt][0])
+        return bigrams
+
+    def solve_by_dictionary(self, min_length: int = 1) -> Set[str]:
+        """Return every dictionary word of at least `min_length` letters
+        that can be traced on the board, by checking dictionary words
+        against the board rather than board paths against the dictionary.
+
+        Candidates are narrowed before any path search: a word needs each
+        of its letters on the board at least as many times as it uses
+        them, and each pair of consecutive letters to appear on adjacent
+        cells. Dictionaries with `children` are walked only along letters
+        that pass both tests; others are filtered word by word.
+        """
+        counts = self.letter_counts()
+        bigrams = self.adjacent_bigrams()
+        try:
+            candidates = self._walk_candidates(min_length, counts, bigrams)
+        except NotImplementedError:
+            candidates = self._filter_candidates(min_length, counts, bigrams)
+        return {word for word in candidates if self.find_word(word) is not None}
+
+    def _walk_candidates(self, min_length: int, counts: Counter, bigrams: Set[str]) -> List[str]:
+        children = self.dictionary.children
+        at_word = self.dictionary.at_word
+        candidates: List[str] = []
+
+        def walk(node, word: str) -> None:
+            for letter, child in children(node):
+                if not counts[letter] or (word and word[-1] + letter not in bigrams):
+                    continue
+                counts[letter] -= 1
+                extended = word + letter
+                if len(extended) >= min_length and at_word(child):
+                    candidates.append(extended)
+                walk(child, extended)
+                counts[letter] += 1
+
+        walk(self.dictionary.cursor(), "")
+        return candidates
+
+    def _filter_candidates(self, min_length: int, counts: Counter,
+                           bigrams: Set[str]) -> Iterable[str]:
+        for word in self.dictionary:
+            if len(word) < min_length:
+                continue
+            if any(counts[letter] < used for letter, used in Counter(word).items()):
+                continue
+            if all(word[i:i + 2] in bigrams for i in range(len(word) - 1)):
+                yield word
+
+    def _solve_pruned(self, min_length: int, tracker) -> Set[str]:
+        found: Set[str] = set()
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        exhausted = tracker.exhausted
+        record = tracker.record
+        trail: List = []
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            node = advance(node, cells[cell])
+            if node is None or exhausted(node):
+                return
+            word += cells[cell]
+            trail.append(node)
+            if at_word(node) and record(trail) and len(word) >= min_length:
+                found.add(word)
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+            trail.pop()
+
+        root = self.dictionary.cursor()
+        for start in range(len(cells)):
+            dfs(start, root, "", 0)
+        return found
+
+    def _solve_instrumented(self, min_length: int, tracker, stats: SolveStats) -> Set[str]:
+        found: Set[str] = set()
+        cells = self.cells
+        neighbors = self.neighbors
+        advance = self.dictionary.advance
+        at_word = self.dictionary.at_word
+        trail: List = []
+
+        def dfs(cell: int, node, word: str, visited: int) -> None:
+            stats.trie_lookups += 1
+            node = advance(node, cells[cell])
+            if node is None:
+                stats.prefix_rejections += 1
+                return
+            if tracker is not None and tracker.exhausted(node):
+                stats.pruned += 1
+                return
+            stats.nodes_visited += 1
+            word += cells[cell]
+            trail.append(node)
+            if len(trail) > stats.max_depth:
+                stats.max_depth = len(trail)
+            if at_word(node) and (tracker is None or tracker.record(trail)) and len(word) >= min_length:
+                found.add(word)
+            visited |= 1 << cell
+            for nxt in neighbors[cell]:
+                if not visited >> nxt & 1:
+                    dfs(nxt, node, word, visited)
+            trail.pop()
+
+        root = self.dictionary.cursor()
+        stats.cell_seconds = [0.0] * len(cells)
+        for start in range(len(cells)):
+            began = time.perf_counter()
+            dfs(start, root, "", 0)
+            stats.cell_seconds[start] = time.perf_counter() - began
+        stats.words_found = len(found)
+        return found
+
+
+class BoardSolution:
+    """The words on a board, with the cells of every path spelling them,
+    kept up to date as single cells change.
+
+    Changing a cell drops the paths through it and searches only for new
+    paths through it, instead of solving the whole board again.
+    """
+
+    def __init__(self, board: List[List[str]], dictionary: BoggleDictionary, min_length: int = 1):
+        self.solver = BoardSolver(board, dictionary)
+        self.min_length = min_length
+        self.masks = self.solver.solve_masks(min_length) # word -> bitmasks of its paths
+        self.last_change: Optional[Tuple] = None # what `undo_change` needs to revert the last change
+        self.by_cell: List[Set[str]] = [set() for _ in self.solver.cells] # cell -> words with a path through it
+        for word, word_masks in self.masks.items():
+            self._index(word, word_masks)
+
+    def words(self) -> Set[str]:
+        return set(self.masks)
+
+    def board(self) -> List[List[str]]:
+        size = self.solver.size
+        cells = self.solver.cells
+        return [cells[r * size:(r + 1) * size] for r in range(size)]
+
+    def change_cell(self, cell: int, label: str) -> Tuple[Set[str], Set[str]]:
+        """Put `label` on `cell` and update the solution. The change can be
+        reverted with `undo_change` until the next change.
+
+        Returns:
+            The words gained and the words lost by the change.
+        """
+        bit = 1 << cell
+        saved: Dict[str, Optional[Set[int]]] = {} # word -> its masks before the change
+        lost = set()
+        for word in self.by_cell[cell]:
+            word_masks = self.masks.get(word)
+            if word_masks is None:
+                continue
+            saved[word] = word_masks
+            word_masks = {mask for mask in word_masks if not mask & bit}
+            if word_masks:
+                self.masks[word] = word_masks
+            else:
+                del self.masks[word]
+                lost.add(word)
+        old_by_cell = self.by_cell[cell]
+        self.by_cell[cell] = set()
+
+        old_label = self.solver.cells[cell]
+        self.solver.cells[cell] = label
+        gained = set()
+        added: List[Tuple[int, str]] = []
+        for word, word_masks in self.solver.solve_through(cell, self.min_length).items():
+            if word in lost:
+                lost.discard(word)
+            elif word not in self.masks:
+                gained.add(word)
+            if word not in saved:
+                previous = self.masks.get(word)
+                saved[word] = None if previous is None else set(previous)
+            self.masks.setdefault(word, set()).update(word_masks)
+            self._index(word, word_masks, added)
+        self.last_change = (cell, old_label, saved, old_by_cell, added)
+        return gained, lost
+
+    def undo_change(self) -> None:
+        """Revert the last `change_cell` without searching the board again.
+
+        Raises:
+            ValueError: There is no change to revert.
+        """
+        if self.last_change is None:
+            raise ValueError("no change to undo")
+        cell, old_label, saved, old_by_cell, added = self.last_change
+        self.last_change = None
+        for other, word in added:
+            self.by_cell[other].discard(word)
+        self.by_cell[cell] = old_by_cell
+        for word, word_masks in saved.items():
+            if word_masks is None:
+                del self.masks[word]
+            else:
+                self.masks[word] = word_masks
+        self.solver.cells[cell] = old_label
+
+    def _index(self, word: str, word_masks: Set[int],
+               added: Optional[List[Tuple[int, str]]] = None) -> None:
+        # with `added`, record the (cell, word) entries that were new
+        by_cell = self.by_cell
+        for mask in word_masks:
+            while mask:
+                low = mask & -mask
+                cell_words = by_cell[low.bit_length() - 1]
+                if added is not None and word not in cell_words:
+                    added.append((low.bit_length() - 1, word))
+                cell_words.add(word)
+                mask ^= low
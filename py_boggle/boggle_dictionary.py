@@ -3,9 +3,11 @@ This module contains the definition of an abstract dictionary class.
 Your concrete implementation inherits from the abstract class.
 """
 
+import itertools
 import typing
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
+from typing import List, Optional
 
 
 class BoggleDictionary(ABC, Iterable):
@@ -17,7 +19,8 @@ class BoggleDictionary(ABC, Iterable):
     """
 
     @abstractmethod
-    def load_dictionary(self, filename: str) -> None:
+    def load_dictionary(self, filename: str, min_length: int = 0,
+                        alphabet: Optional[str] = None) -> None:
         """Load words from a file to this dictionary.
 
         This file should contain one word per line, with the words in
@@ -25,6 +28,8 @@ class BoggleDictionary(ABC, Iterable):
 
         Args:
             filename: The name or path to the dictionary file.
+            min_length: Skip words shorter than this.
+            alphabet: If given, skip words using any character not in it.
 
         Raises:
             OSError: The file cannot be opened or read.
@@ -103,3 +108,187 @@ class BoggleDictionary(ABC, Iterable):
             https://www.programiz.com/python-programming/iterator
         """
         raise NotImplementedError("abstract method `__iter__`")
+
+    def cursor(self) -> typing.Any:
+        """Return a cursor positioned at the empty prefix.
+
+        A cursor is an opaque handle used by the board search to walk the
+        dictionary one tile at a time instead of re-checking the whole
+        prefix at every step. Subclasses with a node structure should
+        override `cursor`, `advance` and `at_word` together; this default
+        uses the prefix string itself as the cursor.
+        """
+        return ""
+
+    def advance(self, cursor: typing.Any, letters: str) -> typing.Any:
+        """Move `cursor` forward over `letters`.
+
+        Args:
+            cursor: A cursor returned by `cursor` or `advance`.
+            letters: The lowercase letters to append to the cursor's prefix.
+
+        Returns:
+            The new cursor, or None if no word starts with the extended prefix.
+        """
+        prefix = cursor + letters
+        return prefix if self.is_prefix(prefix) else None
+
+    def at_word(self, cursor: typing.Any) -> bool:
+        """Return True if the prefix under `cursor` is a word in this dictionary."""
+        return self.contains(cursor)
+
+    def height(self, cursor: typing.Any) -> Optional[int]:
+        """Return the number of letters in the longest continuation of the
+        prefix under `cursor` that is a word, or None if this dictionary
+        cannot tell. Searches use it to stop extending paths early.
+        """
+        return None
+
+    def letters_below(self, cursor: typing.Any) -> Optional[int]:
+        """Return a mask with `letter_bit(c)` set for every letter `c` that
+        appears in some word continuation of the prefix under `cursor`, or
+        None if this dictionary cannot tell.
+        """
+        return None
+
+    def solve_tracker(self) -> typing.Any:
+        """Return a fresh tracker for pruning exhausted subtrees during
+        one board solve, or None if this dictionary does not support it.
+
+        A tracker provides `exhausted(cursor)`, which is True once every
+        word beneath `cursor` has been found, and `record(trail)`, which
+        records the word ending at `trail[-1]` given the cursors on the
+        path to it and returns False if that word was already recorded.
+        """
+        return None
+
+    def children(self, cursor: typing.Any) -> typing.Iterator[typing.Tuple[str, typing.Any]]:
+        """Return an iterator of `(letter, cursor)` pairs, in ascending
+        letter order, for the one-letter extensions of the prefix under
+        `cursor` that are prefixes of some word.
+
+        This is optional. Dictionaries that cannot enumerate extensions
+        raise NotImplementedError.
+        """
+        raise NotImplementedError("method `children`")
+
+    def iter_prefix(self, prefix: str) -> typing.Iterator[str]:
+        """Return an iterator, in lexicographic order, over the words in
+        this dictionary that start with `prefix`.
+
+        This method should be case-insensitive.
+        """
+        prefix = prefix.lower()
+        words = itertools.dropwhile(lambda word: word < prefix, self)
+        return itertools.takewhile(lambda word: word.startswith(prefix), words)
+
+    def iter_range(self, lo: str = "", hi: Optional[str] = None) -> typing.Iterator[str]:
+        """Return an iterator, in lexicographic order, over the words `w`
+        in this dictionary with `lo <= w < hi`. A `hi` of None means no
+        upper bound.
+
+        This method should be case-insensitive.
+        """
+        lo = lo.lower()
+        words = itertools.dropwhile(lambda word: word < lo, self)
+        if hi is None:
+            return words
+        hi = hi.lower()
+        return itertools.takewhile(lambda word: word < hi, words)
+
+
+_READ_CHUNK = 1 << 20 # characters read from a words file at a time
+
+
+def read_words(filename: str, min_length: int = 0, alphabet: Optional[str] = None) -> List[str]:
+    """Return the words in `filename`, lowercased and stripped, in file
+    order, without blank lines.
+
+    The file is read and normalized in large chunks rather than line by
+    line. Words shorter than `min_length`, or using a character outside
+    `alphabet` when one is given, are left out.
+
+    Raises:
+        OSError: The file cannot be opened or read.
+    """
+    words: List[str] = []
+    rest = ""
+    with open(filename) as wordsfile:
+        while True:
+            chunk = wordsfile.read(_READ_CHUNK)
+            if not chunk:
+                break
+            # hold back a partial last line until the next chunk completes it
+            end = chunk.rfind("\n") + 1
+            if not end:
+                rest += chunk
+                continue
+            words += (rest + chunk[:end]).lower().split()
+            rest = chunk[end:]
+    words += rest.lower().split()
+    if min_length > 1:
+        words = [word for word in words if len(word) >= min_length]
+    if alphabet is not None:
+        # stripping every allowed character leaves nothing of a usable word
+        allowed = alphabet.lower()
+        words = [word for word in words if not word.strip(allowed)]
+    return words
+
+
+def letter_bit(letter: str) -> int:
+    """Return the bit standing for `letter` in `letters_below` masks.
+    Letters beyond `a`-`z` may share bits, which only makes masks less precise.
+    """
+    return 1 << (ord(letter) & 63)
+
+
+def walk_words(dictionary: BoggleDictionary, cursor: typing.Any, letters: List[str],
+               lo: str = "", hi: Optional[str] = None) -> typing.Iterator[str]:
+    """Lazily yield, in lexicographic order, the words beneath `cursor`.
+
+    This is a shared implementation of `__iter__`, `iter_prefix` and
+    `iter_range` for dictionaries that provide `children`. It keeps an
+    explicit stack of child iterators and one shared letter buffer, so no
+    word list is ever built.
+
+    Args:
+        dictionary: The dictionary to walk.
+        cursor: Where to start walking.
+        letters: The letters of the prefix under `cursor`. This list is
+            used as the shared buffer and is modified while walking.
+        lo: Skip words less than `lo`. Only meaningful from the root.
+        hi: Stop at the first word not less than `hi`. Only meaningful
+            from the root.
+    """
+    children = dictionary.children
+    at_word = dictionary.at_word
+    if at_word(cursor) and not lo and hi != "":
+        yield "".join(letters)
+    # each frame holds a child iterator and whether the current prefix
+    # still equals the start of `lo` and of `hi`
+    stack = [(children(cursor), bool(lo), hi is not None)]
+    while stack:
+        frame_children, at_lo, at_hi = stack[-1]
+        for letter, child in frame_children:
+            depth = len(letters)
+            child_lo = child_hi = False
+            if at_lo and depth < len(lo):
+                if letter < lo[depth]:
+                    continue
+                child_lo = letter == lo[depth]
+            if at_hi:
+                if depth == len(hi) or letter > hi[depth]:
+                    return
+                child_hi = letter == hi[depth]
+            letters.append(letter)
+            if at_word(child):
+                if child_hi and depth + 1 == len(hi):
+                    return
+                if not (child_lo and depth + 1 < len(lo)):
+                    yield "".join(letters)
+            stack.append((children(child), child_lo, child_hi))
+            break
+        else:
+            stack.pop()
+            if stack:
+                letters.pop()
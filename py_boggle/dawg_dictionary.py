@@ -0,0 +1,292 @@
+import mmap
+import struct
+import sys
+import typing
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from py_boggle.boggle_dictionary import BoggleDictionary, letter_bit, read_words, walk_words
+
+
+# one-byte needles for `bytes.find`, indexed by character code
+_NEEDLES = [bytes((code,)) for code in range(256)]
+
+# Compiled dictionary files start with this header: magic, format version,
+# state count, edge count. All integers are little-endian, and the header is
+# followed by first_edge and targets (uint32), then terminal and labels (bytes).
+MAGIC = b"BOGGLDWG"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIII")
+
+
+def is_compiled(filename: str) -> bool:
+    """Return True if `filename` is a dictionary written by `DawgDictionary.save`."""
+    with open(filename, "rb") as infile:
+        return infile.read(len(MAGIC)) == MAGIC
+
+
+class _BuildNode:
+    """
+    A mutable DAWG state, only used while a dictionary is being built.
+    """
+    __slots__ = ("edges", "is_word")
+
+    def __init__(self):
+        self.edges : Dict[str, _BuildNode] = {}
+        self.is_word = False
+
+    def signature(self) -> Tuple:
+        # children are already minimized here, so their identity is canonical
+        return (self.is_word, tuple((letter, id(child)) for letter, child in self.edges.items()))
+
+
+class DawgDictionary(BoggleDictionary):
+    """
+    A BoggleDictionary stored as a minimized directed acyclic word graph.
+
+    Words that share a suffix share the states that spell it, and the graph
+    is kept in a handful of flat buffers instead of one object per letter:
+    - `first_edge[n]` to `first_edge[n + 1]` is the range of edges leaving state `n`
+    - `labels[e]` is the character code on edge `e`
+    - `targets[e]` is the state edge `e` leads to
+    - `terminal[n]` is 1 if a word ends at state `n`
+    Edges of a state are sorted by label, so iteration is lexicographic.
+    State 0 is the start state. Cursors are state numbers.
+
+    Only characters with codes below 256 can be stored.
+
+    A built dictionary can be written with `save` and loaded again with
+    `load_dictionary`, which memory-maps compiled files and reads the buffers
+    in place, so processes loading the same file share its pages.
+    """
+
+    def __init__(self):
+        self.first_edge = array("I", [0, 0])
+        self.labels = b""
+        self.label_base = 0 # offset of edge 0 within `labels`
+        self.targets = array("I")
+        self.terminal = bytearray(1)
+        self.heights : Optional[array] = None # per-state `height`, computed on first use
+        self.below : Optional[array] = None # per-state `letters_below`, computed with `heights`
+
+    def load_dictionary(self, filename: str, min_length: int = 0,
+                        alphabet: Optional[str] = None) -> None:
+        """
+        Load a word list, or a file written by `save`.
+        A compiled file is mapped as it is, ignoring `min_length` and `alphabet`.
+        Raises ValueError if a compiled file has an unsupported format version.
+        """
+        if is_compiled(filename):
+            self._map(filename)
+            return
+        self.build(read_words(filename, min_length, alphabet))
+
+    def build(self, words: Iterable[str]) -> None:
+        """
+        Replace the contents of this dictionary with `words`.
+        Input in ascending order is built in one pass; anything else is sorted first.
+        """
+        words = list(words)
+        if any(words[i] > words[i + 1] for i in range(len(words) - 1)):
+            words.sort()
+
+        root = _BuildNode()
+        register : Dict[Tuple, _BuildNode] = {}
+        unchecked : List[Tuple[_BuildNode, str, _BuildNode]] = [] # (parent, letter, child) not yet minimized
+        previous = ""
+
+        def minimize(down_to: int) -> None:
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = child.signature()
+                if key in register:
+                    parent.edges[letter] = register[key]
+                else:
+                    register[key] = child
+
+        for word in words:
+            if word == previous:
+                continue
+            common = 0
+            limit = min(len(word), len(previous))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _BuildNode()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.is_word = True
+            previous = word
+        minimize(0)
+        self._freeze(root)
+
+    def _freeze(self, root: _BuildNode) -> None:
+        # number the states breadth-first, then lay their edges out in order
+        number = {id(root): 0}
+        order = [root]
+        for node in order:
+            for child in node.edges.values():
+                if id(child) not in number:
+                    number[id(child)] = len(order)
+                    order.append(child)
+
+        first_edge = array("I")
+        labels = bytearray()
+        targets = array("I")
+        terminal = bytearray(len(order))
+        for index, node in enumerate(order):
+            first_edge.append(len(targets))
+            terminal[index] = node.is_word
+            for letter in sorted(node.edges):
+                code = ord(letter)
+                if code > 255:
+                    raise ValueError(f"character {letter!r} cannot be stored in a DawgDictionary")
+                labels.append(code)
+                targets.append(number[id(node.edges[letter])])
+        first_edge.append(len(targets))
+
+        self.first_edge = first_edge
+        self.labels = bytes(labels)
+        self.label_base = 0
+        self.heights = self.below = None
+        self.targets = targets
+        self.terminal = terminal
+
+    def save(self, filename: str) -> None:
+        """Write this dictionary to `filename` in the compiled format."""
+        first_edge = array("I", self.first_edge)
+        targets = array("I", self.targets)
+        if sys.byteorder == "big":
+            first_edge.byteswap()
+            targets.byteswap()
+        edges = len(targets)
+        with open(filename, "wb") as outfile:
+            outfile.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(self.terminal), edges))
+            outfile.write(first_edge.tobytes())
+            outfile.write(targets.tobytes())
+            outfile.write(bytes(self.terminal))
+            outfile.write(self.labels[self.label_base:self.label_base + edges])
+
+    def _map(self, filename: str) -> None:
+        with open(filename, "rb") as infile:
+            mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, states, edges = _HEADER.unpack_from(mapped)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{filename}: unsupported dictionary format version {version}")
+        view = memoryview(mapped)
+        offset = _HEADER.size
+        first_edge = view[offset:offset + 4 * (states + 1)]
+        offset += 4 * (states + 1)
+        targets = view[offset:offset + 4 * edges]
+        offset += 4 * edges
+        terminal = view[offset:offset + states]
+        offset += states
+
+        if sys.byteorder == "big" or array("I").itemsize != 4:
+            # the uint32 sections cannot be used in place on this platform
+            self.first_edge = array("I", struct.unpack(f"<{states + 1}I", first_edge))
+            self.targets = array("I", struct.unpack(f"<{edges}I", targets))
+        else:
+            self.first_edge = first_edge.cast("I")
+            self.targets = targets.cast("I")
+        self.terminal = terminal
+        self.labels = mapped
+        self.label_base = offset
+        self.heights = self.below = None
+
+    def cursor(self) -> int:
+        return 0
+
+    def advance(self, cursor: int, letters: str) -> Optional[int]:
+        first_edge = self.first_edge
+        base = self.label_base
+        for letter in letters:
+            code = ord(letter)
+            if code > 255:
+                return None
+            edge = self.labels.find(_NEEDLES[code], base + first_edge[cursor], base + first_edge[cursor + 1])
+            if edge < 0:
+                return None
+            cursor = self.targets[edge - base]
+        return cursor
+
+    def at_word(self, cursor: int) -> bool:
+        return self.terminal[cursor] == 1
+
+    def height(self, cursor: int) -> int:
+        if self.heights is None:
+            self._summarize()
+        return self.heights[cursor]
+
+    def letters_below(self, cursor: int) -> int:
+        if self.below is None:
+            self._summarize()
+        return self.below[cursor]
+
+    def _summarize(self) -> None:
+        # a state's summaries depend on its successors' summaries, so visit
+        # the states in depth-first post-order
+        first_edge = self.first_edge
+        targets = self.targets
+        states = len(self.terminal)
+        heights = array("H", bytes(2 * states))
+        below = array("Q", bytes(8 * states))
+        labels = self.labels
+        base = self.label_base
+        order = []
+        seen = bytearray(states)
+        stack = [(0, first_edge[0])]
+        seen[0] = 1
+        while stack:
+            state, edge = stack[-1]
+            if edge == first_edge[state + 1]:
+                stack.pop()
+                order.append(state)
+                continue
+            stack[-1] = (state, edge + 1)
+            target = targets[edge]
+            if not seen[target]:
+                seen[target] = 1
+                stack.append((target, first_edge[target]))
+        for state in order:
+            best = 0
+            letters = 0
+            for edge in range(first_edge[state], first_edge[state + 1]):
+                target = targets[edge]
+                if heights[target] + 1 > best:
+                    best = heights[target] + 1
+                letters |= below[target] | letter_bit(chr(labels[base + edge]))
+            heights[state] = best
+            below[state] = letters
+        self.heights = heights
+        self.below = below
+
+    def is_prefix(self, prefix: str) -> bool:
+        return self.advance(0, prefix.lower()) is not None
+
+    def contains(self, word: str) -> bool:
+        state = self.advance(0, word.lower())
+        return state is not None and self.terminal[state] == 1
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return walk_words(self, 0, [])
+
+    def children(self, cursor: int) -> typing.Iterator[Tuple[str, int]]:
+        labels = self.labels
+        base = self.label_base
+        targets = self.targets
+        for edge in range(self.first_edge[cursor], self.first_edge[cursor + 1]):
+            yield chr(labels[base + edge]), targets[edge]
+
+    def iter_prefix(self, prefix: str) -> typing.Iterator[str]:
+        prefix = prefix.lower()
+        state = self.advance(0, prefix)
+        if state is None:
+            return iter(())
+        return walk_words(self, state, list(prefix))
+
+    def iter_range(self, lo: str = "", hi: Optional[str] = None) -> typing.Iterator[str]:
+        return walk_words(self, 0, [], lo.lower(), None if hi is None else hi.lower())
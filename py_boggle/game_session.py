@@ -0,0 +1,114 @@
+"""
+This module contains a game session for several players sharing one board.
+
+The board is solved once, into the word-path index of a `MyGameManager`,
+and every player's guesses are checked against that index. Alongside each
+player's plain score the session keeps a classic Boggle score, where a
+word found by more than one player scores for nobody.
+"""
+
+from typing import Dict, KeysView, List, Optional, Tuple
+
+from py_boggle.boggle_dictionary import BoggleDictionary
+from py_boggle.my_game_manager import SHORT, MyGameManager
+
+
+class Player:
+    """One player's guesses and scores within a `GameSession`."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.words: List[str] = [] # accepted words, in the order they were added
+        self.score = 0 # points for every accepted word
+        self.unique_score = 0 # points for accepted words no other player found
+        self.last_added_word: Optional[List[Tuple[int, int]]] = None
+
+
+class GameSession:
+    """Hosts any number of players on one board.
+
+    Call `new_game` or `set_game` before adding words, as with
+    `MyGameManager`. Starting a new board keeps the players but clears
+    their words and scores.
+    """
+
+    def __init__(self, dictionary: Optional[BoggleDictionary] = None):
+        """Create a session. Give `dictionary` to start games with
+        `set_game` without calling `new_game` first.
+        """
+        self.game = MyGameManager() # holds the board and its solved word index
+        self.game.index_words = True
+        if dictionary is not None:
+            self.game.dictionary = dictionary
+        self.players: Dict[str, Player] = {}
+        self.finders: Dict[str, List[str]] = {} # word -> names of the players who found it
+
+    def new_game(self, size: int, cubefile: str, dictionary: BoggleDictionary) -> None:
+        self.game.new_game(size, cubefile, dictionary)
+        self._reset_players()
+
+    def set_game(self, board: List[List[str]]) -> None:
+        self.game.set_game(board)
+        self._reset_players()
+
+    def set_solved_game(self, board: List[List[str]], word_paths: Dict[str, List[int]]) -> None:
+        """Like `set_game`, with the word-path index solved elsewhere."""
+        self.game.set_solved_game(board, word_paths)
+        self._reset_players()
+
+    def get_board(self) -> List[List[str]]:
+        return self.game.get_board()
+
+    def all_words(self) -> KeysView[str]:
+        """Return every scoring word on the board."""
+        return self.game.word_path_index().keys()
+
+    def add_player(self, name: str) -> Player:
+        """Add a player, or return the existing player called `name`."""
+        if name not in self.players:
+            self.players[name] = Player(name)
+        return self.players[name]
+
+    def add_word(self, name: str, word: str) -> int:
+        """Add a guess for the player `name`.
+
+        Returns:
+            The point value of the word, or zero if it is invalid or the
+            player already added it. Whether other players also found the
+            word only affects `unique_score`.
+
+        Raises:
+            KeyError: There is no player called `name`.
+        """
+        player = self.players[name]
+        word = word.lower()
+        path = self.game.word_path_index().get(word)
+        if path is None:
+            return 0
+        finders = self.finders.setdefault(word, [])
+        if name in finders:
+            return 0
+        points = len(word) - SHORT
+        if not finders:
+            player.unique_score += points
+        elif len(finders) == 1:
+            self.players[finders[0]].unique_score -= points
+        finders.append(name)
+        player.words.append(word)
+        player.score += points
+        player.last_added_word = self.game.solver.coords(path)
+        return points
+
+    def get_score(self, name: str) -> int:
+        return self.players[name].score
+
+    def get_unique_score(self, name: str) -> int:
+        return self.players[name].unique_score
+
+    def get_last_added_word(self, name: str) -> Optional[List[Tuple[int, int]]]:
+        return self.players[name].last_added_word
+
+    def _reset_players(self) -> None:
+        self.finders = {}
+        for name in self.players:
+            self.players[name] = Player(name)
@@ -0,0 +1,237 @@
+"""
+This module contains a dictionary that holds several word lists in one trie.
+
+Word lists that mostly overlap, such as a tournament list and a
+family-friendly list, share every node they have in common. Each node
+records which lists hold the word ending there and which lists hold some
+word at or below it, as bitmasks with one bit per list. A `WordList`
+view plays a game against one list. `BoardSolver.solve_lists` solves a
+board for every list at once.
+"""
+
+import typing
+from typing import Dict, List, Optional, Set
+
+from py_boggle.boggle_dictionary import BoggleDictionary, read_words, walk_words
+from py_boggle.trie_dictionary import TrieDictionary, TrieNode
+
+
+class ListNode(TrieNode):
+    """A `TrieNode` that also records which word lists reach it."""
+
+    def __init__(self):
+        super().__init__()
+        self.lists = 0 # bit i set if list i holds the word ending here
+        self.lists_below = 0 # bit i set if list i holds a word ending at or below here
+
+
+class MultiDictionary(TrieDictionary):
+    """
+    A trie shared by several named word lists.
+    As a dictionary in its own right it holds every word of every list.
+    Use `select` for a dictionary holding one list.
+    """
+
+    node_class = ListNode
+
+    def __init__(self):
+        super().__init__()
+        self.names : List[str] = [] # list names, in bit order
+
+    def load_dictionary(self, filename: str, min_length: int = 0,
+                        alphabet: Optional[str] = None) -> None:
+        """
+        Add `filename` as a word list named after the file.
+        """
+        self.add_list(filename, filename, min_length, alphabet)
+
+    def add_list(self, name: str, filename: str, min_length: int = 0,
+                 alphabet: Optional[str] = None) -> int:
+        """
+        Add the words in `filename` as the word list `name`, with the same
+        options as `load_dictionary`, and return the list's bit.
+        Raises ValueError if there is already a list called `name`.
+        """
+        return self.add_words(name, read_words(filename, min_length, alphabet))
+
+    def add_words(self, name: str, words: List[str]) -> int:
+        """
+        Add `words` as the word list `name` and return the list's bit.
+        Raises ValueError if there is already a list called `name`.
+        """
+        if name in self.names:
+            raise ValueError(f"word list {name!r} is already loaded")
+        bit = 1 << len(self.names)
+        self.names.append(name)
+        if not self.root.children and not self.root.is_word:
+            # the first list fills an empty trie, so every node is its own
+            self.build(words)
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                node.lists_below = bit
+                if node.is_word:
+                    node.lists = bit
+                stack.extend(node.children.values())
+            return bit
+        for word in words:
+            path = self._insert(word)
+            path[-1].lists |= bit
+            for node in path:
+                node.lists_below |= bit
+        return bit
+
+    def insert(self, word: str, name: Optional[str] = None) -> bool:
+        """
+        Add `word` to the word list `name`, or to every list if `name` is
+        None, while the dictionary is in use, as `TrieDictionary.insert`.
+        Returns False if `word` is empty or already in those lists.
+        Raises KeyError if there is no list called `name`.
+        """
+        word = word.lower()
+        mask = self._lists_mask(name)
+        with self.update_lock:
+            node = self.traverse(word)
+            if not word or (node is not None and node.is_word and node.lists & mask == mask):
+                return False
+            path = self._copy_path(word)
+            if not path[-1].is_word:
+                path[-1].is_word = True
+                self._count_added(path, word)
+            path[-1].lists |= mask
+            for step in path:
+                step.lists_below |= mask
+            self._publish(path[0])
+        self._notify(word, True)
+        return True
+
+    def delete(self, word: str, name: Optional[str] = None) -> bool:
+        """
+        Remove `word` from the word list `name`, or from every list if
+        `name` is None, as `TrieDictionary.delete`. The word leaves the
+        trie once no list holds it.
+        Returns False if no such list holds `word`.
+        Raises KeyError if there is no list called `name`.
+        """
+        word = word.lower()
+        mask = self._lists_mask(name)
+        with self.update_lock:
+            node = self.traverse(word)
+            if not word or node is None or not node.is_word or (mask and not node.lists & mask):
+                return False
+            path = self._copy_path(word)
+            path[-1].lists &= ~mask
+            if not path[-1].lists:
+                path[-1].is_word = False
+                self._count_removed(path, word)
+            for step in reversed(path):
+                step.lists_below = step.lists
+                for child in step.children.values():
+                    step.lists_below |= child.lists_below
+            self._publish(path[0])
+        self._notify(word, False)
+        return True
+
+    def _lists_mask(self, name: Optional[str]) -> int:
+        if name is None:
+            return (1 << len(self.names)) - 1
+        return self.list_bit(name)
+
+    def list_bit(self, name: str) -> int:
+        """
+        Return the bit of the word list `name`.
+        Raises KeyError if there is no such list.
+        """
+        if name not in self.names:
+            raise KeyError(f"no word list {name!r}")
+        return 1 << self.names.index(name)
+
+    def select(self, name: str) -> "WordList":
+        """
+        Return a dictionary holding only the word list `name`.
+        Raises KeyError if there is no such list.
+        """
+        return WordList(self, name)
+
+    def word_lists(self, cursor: ListNode) -> int:
+        """
+        Return the bits of the lists holding the word under `cursor`.
+        """
+        return cursor.lists
+
+    def lists_of(self, word: str) -> List[str]:
+        """
+        Return the names of the lists holding `word`.
+        """
+        node = self.traverse(word.lower())
+        mask = node.lists if node is not None else 0
+        return [name for i, name in enumerate(self.names) if mask >> i & 1]
+
+    def split(self, tagged: Dict[str, int]) -> Dict[str, Set[str]]:
+        """
+        Turn a map from words to list bits, as returned by
+        `BoardSolver.solve_lists`, into the set of words of each list.
+        """
+        return {name: {word for word, mask in tagged.items() if mask >> i & 1}
+                for i, name in enumerate(self.names)}
+
+
+class WordList(BoggleDictionary):
+    """
+    One word list of a `MultiDictionary`, as a dictionary of its own.
+    Searches through a view skip every subtree without a word of its list.
+    """
+
+    def __init__(self, shared: MultiDictionary, name: str):
+        self.shared = shared # the dictionary holding every list
+        self.name = name
+        self.bit = shared.list_bit(name)
+
+    def load_dictionary(self, filename: str, min_length: int = 0,
+                        alphabet: Optional[str] = None) -> None:
+        raise NotImplementedError("add word lists through the MultiDictionary")
+
+    def is_prefix(self, prefix: str) -> bool:
+        node = self.shared.traverse(prefix.lower())
+        return node is not None and bool(node.lists_below & self.bit)
+
+    def contains(self, word: str) -> bool:
+        node = self.shared.traverse(word.lower())
+        return node is not None and bool(node.lists & self.bit)
+
+    def cursor(self) -> ListNode:
+        return self.shared.root
+
+    def advance(self, cursor: ListNode, letters: str) -> Optional[ListNode]:
+        node = self.shared.advance(cursor, letters)
+        if node is None or not node.lists_below & self.bit:
+            return None
+        return node
+
+    def at_word(self, cursor: ListNode) -> bool:
+        return bool(cursor.lists & self.bit)
+
+    # both summaries cover every list, which only makes them less tight
+    def height(self, cursor: ListNode) -> int:
+        return cursor.height
+
+    def letters_below(self, cursor: ListNode) -> int:
+        return cursor.below
+
+    def children(self, cursor: ListNode) -> typing.Iterator[typing.Tuple[str, ListNode]]:
+        bit = self.bit
+        return iter(sorted((letter, child) for letter, child in cursor.children.items()
+                           if child.lists_below & bit))
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return walk_words(self, self.shared.root, [])
+
+    def iter_prefix(self, prefix: str) -> typing.Iterator[str]:
+        prefix = prefix.lower()
+        node = self.shared.traverse(prefix)
+        if node is None or not node.lists_below & self.bit:
+            return iter(())
+        return walk_words(self, node, list(prefix))
+
+    def iter_range(self, lo: str = "", hi: Optional[str] = None) -> typing.Iterator[str]:
+        return walk_words(self, self.shared.root, [], lo.lower(), None if hi is None else hi.lower())
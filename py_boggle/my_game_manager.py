@@ -1,9 +1,13 @@
-import copy
+import os
 import random
-from typing import List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+from py_boggle.board_solver import BoardSolution, BoardSolver, SearchBudget, SolveStats
 from py_boggle.boggle_dictionary import BoggleDictionary
 from py_boggle.boggle_game import BoggleGame
+from py_boggle.multi_dictionary import MultiDictionary, WordList
+from py_boggle.solution_cache import SolutionCache
 
 """
 ************** READ THIS ***************
@@ -21,6 +25,44 @@ Groupmate 2: TODO
 SHORT = 3
 CUBE_SIDES = 6
 
+
+def load_cubes(cubefile: str) -> List[Tuple[str, ...]]:
+    """Return the lowercased cubes in `cubefile`, each as a tuple of its faces.
+
+    A line of exactly six characters is a cube with one letter per face.
+    A line of six whitespace-separated labels, e.g. `h i m n qu u`, is a
+    cube whose faces can hold several letters. Other lines are ignored.
+
+    Files are parsed once and then served from memory until they change on disk.
+
+    Raises:
+        OSError: The `cubefile` cannot be opened or read.
+    """
+    return list(_parse_cubes(cubefile, os.stat(cubefile).st_mtime_ns))
+
+
+def cube_alphabet(cubefile: str) -> str:
+    """Return every letter on any face of the cubes in `cubefile`, sorted.
+
+    Words using any other letter can never be played on a board rolled
+    from these cubes; see the `alphabet` option of `load_dictionary`.
+    """
+    return "".join(sorted({letter for cube in load_cubes(cubefile) for face in cube for letter in face}))
+
+
+@lru_cache(maxsize=16)
+def _parse_cubes(cubefile: str, mtime_ns: int) -> Tuple[Tuple[str, ...], ...]:
+    cubes = []
+    with open(cubefile, 'r') as infile:
+        for line in infile:
+            faces = line.lower().split()
+            if len(faces) == 1:
+                faces = list(faces[0])
+            if len(faces) == CUBE_SIDES:
+                cubes.append(tuple(faces))
+    return tuple(cubes)
+
+
 class MyGameManager(BoggleGame):
     """Your implementation of `BoggleGame`
     """
@@ -40,13 +82,26 @@ class MyGameManager(BoggleGame):
         self.words: List[str] # player's current words
         self.dictionary: BoggleDictionary # the dictionary to use
         self.last_added_word: Optional[List[Tuple[int, int]]] # the position of the last added word, or None
+        self.solver: BoardSolver # search engine over the current board
+        self.prune_found = False # skip trie subtrees whose words were all found during a solve
+        self.collect_stats = False # record a SolveStats for each board-driven search
+        self.last_stats: Optional[SolveStats] = None # counters from the last recorded search
+        self.solution_cache: Optional[SolutionCache] = None # board solutions shared across games with this dictionary
+        self.search_budget: Optional[SearchBudget] = None # limits for board-driven searches on large boards
+        self.max_word_length: Optional[int] = None # longest word a budgeted search looks for; None for the dictionary's longest
+        self.index_words = False # solve each board once, on the first guess, so add_word is a lookup
+        self.word_paths: Optional[Dict[str, List[int]]] = None # cells of every scoring word on the board, once indexed
+        self.guessed: Set[str] = set() # the player's words, for constant-time duplicate checks
+        self.word_list: Optional[str] = None # with a MultiDictionary, the list new games are played with; None for all of them
+        self.cache_list: Optional[str] = None # the word list of the current game, which `solution_cache` holds solutions for
+        self.list_caches: Dict[Optional[str], SolutionCache] = {} # solution caches of the other word lists
+        self.solution: Optional[BoardSolution] = None # every path of every word, once a cell has been changed
+        self.score = 0 # the player's current score
 
     def new_game(self, size: int, cubefile: str, dictionary: BoggleDictionary) -> None:
         """This method is provided for you, but feel free to change it.
         """
-        with open(cubefile, 'r') as infile:
-            faces = [line.strip() for line in infile]
-        cubes = [f.lower() for f in faces if len(f) == CUBE_SIDES]
+        cubes = load_cubes(cubefile)
         if size < 2 or len(cubes) < size*size:
             raise ValueError('ERROR: Invalid Dimensions (size, cubes)')
         random.shuffle(cubes)
@@ -55,9 +110,36 @@ class MyGameManager(BoggleGame):
                     for r in range(size)] for c in range(size)]
         self.size = size
         self.words = []
+        self.guessed = set()
+        self.score = 0
+        if isinstance(dictionary, WordList) and self.word_list is None:
+            # a view passed in is the list to play with
+            self.word_list = dictionary.name
+        elif self.word_list is not None:
+            if isinstance(dictionary, WordList):
+                dictionary = dictionary.shared
+            dictionary = dictionary.select(self.word_list)
         self.dictionary = dictionary
+        self._use_list_cache()
         self.last_added_word = None
-
+        self._board_changed()
+
+    def _use_list_cache(self) -> None:
+        # a cache holds one dictionary's solutions, so each word list gets its own
+        if self.solution_cache is not None and self.word_list != self.cache_list:
+            self.list_caches[self.cache_list] = self.solution_cache
+            cache = self.list_caches.pop(self.word_list, None)
+            if cache is None:
+                cache = self.solution_cache.sibling(f"list-{self.word_list}")
+            self.solution_cache = cache
+        self.cache_list = self.word_list
+
+    def _board_changed(self, word_paths: Optional[Dict[str, List[int]]] = None) -> None:
+        # the index is built on first use, so a board replaced right away
+        # (e.g. `new_game` then `set_game`) is never solved
+        self.solver = BoardSolver(self.board, self.dictionary)
+        self.word_paths = word_paths
+        self.solution = None
 
     def get_board(self) -> List[List[str]]:
         """This method is provided for you, but feel free to change it.
@@ -71,48 +153,77 @@ class MyGameManager(BoggleGame):
         (see documentation in boggle_game.py).
         If `word` is not present on the board, return None.
         """
-        word = word.lower()
-
-        def dfs(x, y, word_remaining, path):
-            if not (0 <= x < self.size) or not (0 <= y < self.size) or (x, y) in path:
-                return None
-
-            if self.board[x][y] != word_remaining[0]:
-                return None
-
-            updated_path = path + [(x, y)]
-
-            if len(word_remaining) == 1:
-                return updated_path
-
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    result = dfs(x + dx, y + dy, word_remaining[1:], updated_path)
-                    if result:
-                        return result
-            return None
-
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == word[0]:  # if the first character matches
-                    result = dfs(i, j, word, [])
-                    if result:
-                        return result
-        return None
+        return self.solver.find_word(word.lower())
 
     def add_word(self, word: str) -> int:
         """This method is provided for you, but feel free to change it.
         """
         word = word.lower()
-        if (len(word) > SHORT and word not in self.words and self.dictionary.contains(word)):
+        if len(word) <= SHORT or word in self.guessed:
+            return 0
+        if self.index_words:
+            path = self.word_path_index().get(word)
+            location = None if path is None else self.solver.coords(path)
+        elif self.dictionary.contains(word):
             location = self.find_word_in_board(word)
-            if location is not None:
-                self.last_added_word = location
-                self.words.append(word)
-                return len(word) - SHORT
-        return 0
+        else:
+            location = None
+        if location is None:
+            return 0
+        self.last_added_word = location
+        self.words.append(word)
+        self.guessed.add(word)
+        self.score += len(word) - SHORT
+        return len(word) - SHORT
+
+    def add_words(self, words: Iterable[str]) -> List[Tuple[str, int]]:
+        """Add a batch of guesses, in order, as if by repeated `add_word` calls.
+
+        The board is solved once, if it has not been indexed already, and
+        every guess is checked against that index.
+
+        Returns:
+            A `(word, points)` pair per guess, with the word lowercased and
+            zero points for guesses that were invalid or already added.
+        """
+        word_paths = self.word_path_index()
+        guessed = self.guessed
+        results = []
+        last_path = None
+        for word in words:
+            word = word.lower()
+            path = word_paths.get(word)
+            if path is None or word in guessed:
+                results.append((word, 0))
+                continue
+            guessed.add(word)
+            self.words.append(word)
+            points = len(word) - SHORT
+            self.score += points
+            last_path = path
+            results.append((word, points))
+        if last_path is not None:
+            self.last_added_word = self.solver.coords(last_path)
+        return results
+
+    def replay(self, board: List[List[str]], words: Iterable[str]) -> List[Tuple[str, int]]:
+        """Score a recorded game: set up `board` with no guesses yet, then
+        add `words` with `add_words`.
+        """
+        self.set_game(board)
+        self.words = []
+        self.guessed = set()
+        self.score = 0
+        self.last_added_word = None
+        return self.add_words(words)
+
+    def word_path_index(self) -> Dict[str, List[int]]:
+        """Return the cells of a path of every scoring word on the board,
+        solving the board the first time it is asked for.
+        """
+        if self.word_paths is None:
+            self.word_paths = self.solver.solve_paths(SHORT + 1)
+        return self.word_paths
 
     def get_last_added_word(self) -> Optional[List[Tuple[int, int]]]:
         """This method is provided for you, but feel free to change it.
@@ -123,11 +234,85 @@ class MyGameManager(BoggleGame):
         """This method is provided for you, but feel free to change it.
         """
         self.board = [[c.lower() for c in row] for row in board]
+        self._board_changed()
+
+    def set_solved_game(self, board: List[List[str]], word_paths: Dict[str, List[int]]) -> None:
+        """Like `set_game`, but with the board's word-path index already
+        computed elsewhere (e.g. by `BoardSolver.solve_paths` in another
+        process), so the board is not solved again here.
+        """
+        self.board = [[c.lower() for c in row] for row in board]
+        self._board_changed(word_paths)
+
+    def change_cell(self, row: int, col: int, label: str) -> Set[str]:
+        """Put `label` on the board at (`row`, `col`) without solving the
+        whole board again.
+
+        The first change records every path of every word on the board;
+        each change after that re-explores only the paths through the
+        changed cell. The player's words and score are kept.
+
+        Returns:
+            Every scoring word on the updated board.
+        """
+        if self.solution is None:
+            self.solution = BoardSolution(self.board, self.dictionary, SHORT + 1)
+            self.solver = self.solution.solver
+        solution = self.solution
+        label = label.lower()
+        cell = row * self.solver.size + col
+        moved = set(solution.by_cell[cell])
+        gained, lost = solution.change_cell(cell, label)
+        self.board[row][col] = label
+        if self.word_paths is not None:
+            for word in lost:
+                del self.word_paths[word]
+            # surviving words whose recorded path went through the cell now
+            # take another path
+            for word in moved - lost:
+                if cell in self.word_paths.get(word, ()):
+                    self.word_paths[word] = self.solver.find_path(word)
+            for word in gained:
+                self.word_paths[word] = self.solver.find_path(word)
+        return solution.words()
+
+    def hint(self, count: int = 5) -> List[str]:
+        """Return up to `count` of the highest-scoring words on the board
+        that the player has not found yet, best first.
+
+        With a `search_budget`, the search stops when the budget runs out
+        and returns the best words found by then.
+        """
+        return self.solver.top_words(count, SHORT + 1, self.guessed, self.search_budget)
+
+    def word_path_counts(self) -> Dict[str, int]:
+        """Return, for every scoring word on the board, how many distinct
+        paths spell it.
+        """
+        return dict(self.solver.solve_path_counts(SHORT + 1))
+
+    def all_word_paths(self, word: str) -> List[List[Tuple[int, int]]]:
+        """Return the coordinates of every distinct path spelling `word`,
+        or an empty list if it is not a scoring word on the board.
+        """
+        word = word.lower()
+        if len(word) <= SHORT or not self.dictionary.contains(word):
+            return []
+        return [self.solver.coords(path) for path in self.solver.find_all_paths(word)]
+
+    def words_by_list(self) -> Dict[str, Set[str]]:
+        """Return the scoring words on the board for every word list of the
+        game's `MultiDictionary`, from one search of the board.
+        """
+        shared = self.dictionary.shared if isinstance(self.dictionary, WordList) else self.dictionary
+        if not isinstance(shared, MultiDictionary):
+            raise TypeError("the game's dictionary has no word lists")
+        return shared.split(BoardSolver(self.board, shared).solve_lists(SHORT + 1))
 
     def get_score(self) -> int:
         """This method is provided for you, but feel free to change it.
         """
-        return sum([len(word) - SHORT for word in self.words])
+        return self.score
 
     def dictionary_driven_search(self) -> Set[str]:
         """Find all words using a dictionary-driven search.
@@ -138,13 +323,7 @@ class MyGameManager(BoggleGame):
         Returns:
             A set containing all words found on the board.
         """
-        valid_words = set()
-
-        for word in self.dictionary:
-            if len(word) > SHORT and word not in self.words and self.find_word_in_board(word):
-                valid_words.add(word)
-
-        return valid_words
+        return {word for word in self.solver.solve_by_dictionary(SHORT + 1) if word not in self.guessed}
 
     def board_driven_search(self) -> Set[str]:
         """Find all words using a board-driven search.
@@ -156,29 +335,39 @@ class MyGameManager(BoggleGame):
         Returns:
             A set containing all words found on the board.
         """
-        found_words = set()
-
-        def dfs(x, y, current_word, visited):
-            if not (0 <= x < self.size) or not (0 <= y < self.size) or (x, y) in visited:
-                return
-
-            new_word = current_word + self.board[x][y]
-
-            if not self.dictionary.is_prefix(new_word):
-                return
-
-            if self.dictionary.contains(new_word) and len(new_word) > SHORT:
-                found_words.add(new_word)
-
-            new_visited = copy.deepcopy(visited)
-            new_visited.add((x, y))
-
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    dfs(x + dx, y + dy, new_word, new_visited)
-
-        for i in range(self.size):
-            for j in range(self.size):
-                dfs(i, j, "", set())
-
-        return found_words
+        if self.collect_stats:
+            self.last_stats = SolveStats()
+            return self.solver.solve(SHORT + 1, prune=self.prune_found, stats=self.last_stats)
+        if self.word_paths is not None or self.index_words:
+            return self._served_in_full(set(self.word_path_index()))
+        if self.solution_cache is not None:
+            words = self.solution_cache.get(self.board)
+            if words is not None:
+                return self._served_in_full(set(words))
+        # a solve overlapping a live word change may have seen the old words,
+        # and the cache was already told about the change, so it must not be stored
+        version = self._dictionary_version()
+        if self.search_budget is not None:
+            # a partial result must not be cached as the board's solution
+            words = self.solver.solve_bounded(SHORT + 1, self.max_word_length, self.search_budget)
+            if self.search_budget.complete:
+                self._cache_solution(words, version)
+            return words
+        words = self.solver.solve(SHORT + 1, prune=self.prune_found)
+        self._cache_solution(words, version)
+        return words
+
+    def _served_in_full(self, words: Set[str]) -> Set[str]:
+        # a full solution found without searching; the budget must not still
+        # report an earlier search that ran out
+        if self.search_budget is not None:
+            self.search_budget.complete = True
+        return words
+
+    def _dictionary_version(self) -> Optional[int]:
+        # the number of live word changes, for dictionaries that count them
+        return getattr(getattr(self.dictionary, "shared", self.dictionary), "version", None)
+
+    def _cache_solution(self, words: Set[str], version: Optional[int]) -> None:
+        if self.solution_cache is not None and self._dictionary_version() == version:
+            self.solution_cache.put(self.board, words)
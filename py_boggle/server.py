@@ -0,0 +1,185 @@
+"""
+This module contains an asyncio server hosting many Boggle games at once.
+
+Clients connect over TCP and exchange one JSON object per line. Every
+request names an `op`; every reply has `"ok": true` plus results, or
+`"ok": false` and an `"error"` message. Requests:
+    {"op": "join", "room": R, "player": P}
+        Join (creating if needed) room R. Replies with the board, if any.
+    {"op": "new_game", "room": R, "size": N}
+    {"op": "new_game", "room": R, "board": [["a", "b"], ["c", "d"]]}
+        Start a random N x N game, or a game on the given board.
+    {"op": "guess", "room": R, "player": P, "word": W}
+        Replies with the points for W, P's score and W's path.
+    {"op": "scores", "room": R}
+        Replies with every player's score and unique-word score.
+    {"op": "words", "room": R}
+        Replies with every scoring word on the board.
+
+All games share one dictionary. Boards are solved off the event loop, in
+a process pool when one is given, so a slow solve never holds up guesses
+in other rooms. Guesses in a room whose board is still being solved wait
+for that solve. If setting up a game fails, the room has no game until
+the next `new_game` succeeds.
+"""
+
+import asyncio
+import functools
+import json
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
+from py_boggle import batch_solver
+from py_boggle.boggle_dictionary import BoggleDictionary
+from py_boggle.game_session import GameSession
+from py_boggle.my_game_manager import MyGameManager
+
+
+class Room:
+    """One game hosted by the server."""
+
+    def __init__(self, dictionary: BoggleDictionary):
+        self.session = GameSession(dictionary)
+        self.solving: Optional[asyncio.Future] = None # the board solve in progress, if any
+        self.started = False # whether the room has a board
+
+
+class BoggleServer:
+    """Serves games over line-delimited JSON.
+
+    Args:
+        dictionary: The dictionary shared by every game.
+        cubefile: The cubes used for random boards.
+        executor: Where boards are solved. A pool from
+            `batch_solver.worker_pool` solves against each worker's own copy
+            of the dictionary, which must be loaded with the same options
+            and does not see words later inserted into or deleted from
+            `dictionary`; None solves in a thread of this process.
+    """
+
+    def __init__(self, dictionary: BoggleDictionary, cubefile: str,
+                 executor: Optional[Executor] = None):
+        self.dictionary = dictionary
+        self.cubefile = cubefile
+        self.executor = executor
+        self.rooms: Dict[str, Room] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Start listening and return the asyncio server."""
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.handle_line(line)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_line(self, line: bytes) -> Dict:
+        try:
+            request = json.loads(line)
+            handler = getattr(self, "op_" + str(request.get("op")), None)
+            if handler is None:
+                raise ValueError(f"unknown op {request.get('op')!r}")
+            return dict(ok=True, **await handler(request))
+        except (ValueError, KeyError, TypeError, AttributeError) as err:
+            return {"ok": False, "error": str(err)}
+        except Exception as err:
+            # e.g. a failed solve or an unreadable cubes file; the client
+            # still gets a reply and the connection stays open
+            return {"ok": False, "error": f"{type(err).__name__}: {err}"}
+
+    def _room_for(self, request: Dict) -> Room:
+        name = request["room"]
+        if name not in self.rooms:
+            self.rooms[name] = Room(self.dictionary)
+        return self.rooms[name]
+
+    def _room(self, request: Dict) -> Room:
+        room = self.rooms.get(request["room"])
+        if room is None:
+            raise KeyError(f"no room {request['room']!r}")
+        return room
+
+    async def _started(self, request: Dict) -> Room:
+        room = self._room(request)
+        if room.solving is not None:
+            try:
+                await asyncio.shield(room.solving)
+            except Exception:
+                pass # the failure is reported to whoever started the game
+        if not room.started:
+            raise ValueError("no game in progress")
+        return room
+
+    async def op_join(self, request: Dict) -> Dict:
+        room = self._room_for(request)
+        room.session.add_player(request["player"])
+        return {"board": room.session.get_board() if room.started else None}
+
+    async def op_new_game(self, request: Dict) -> Dict:
+        room = self._room_for(request)
+        if room.solving is not None:
+            raise ValueError("a new game is already being set up")
+        if "board" in request:
+            board = [[cell.lower() for cell in row] for row in request["board"]]
+            if any(len(row) != len(board) for row in board):
+                raise ValueError("board is not square")
+        else:
+            generator = MyGameManager()
+            generator.new_game(int(request["size"]), self.cubefile, self.dictionary)
+            board = generator.get_board()
+
+        room.solving = asyncio.ensure_future(self._solve(board))
+        try:
+            word_paths = await room.solving
+        except Exception:
+            room.started = False # guesses for the new board must not score on the old one
+            raise
+        finally:
+            room.solving = None
+        room.session.set_solved_game(board, word_paths)
+        room.started = True
+        return {"board": room.session.get_board()}
+
+    async def _solve(self, board: List[List[str]]) -> Dict[str, List[int]]:
+        loop = asyncio.get_running_loop()
+        if self.executor is None:
+            call = functools.partial(batch_solver.solve_board_paths, board, self.dictionary)
+            return await loop.run_in_executor(None, call)
+        return await loop.run_in_executor(self.executor, batch_solver.solve_board_paths_in_worker, board)
+
+    async def op_guess(self, request: Dict) -> Dict:
+        room = await self._started(request)
+        name = request["player"]
+        points = room.session.add_word(name, request["word"])
+        return {
+            "points": points,
+            "score": room.session.get_score(name),
+            "path": room.session.get_last_added_word(name) if points else None,
+        }
+
+    async def op_scores(self, request: Dict) -> Dict:
+        room = await self._started(request)
+        return {"scores": {
+            name: [player.score, player.unique_score] for name, player in room.session.players.items()
+        }}
+
+    async def op_words(self, request: Dict) -> Dict:
+        room = await self._started(request)
+        return {"words": sorted(room.session.all_words())}
+
+
+async def serve(dictionary: BoggleDictionary, cubefile: str, host: str, port: int,
+                executor: Optional[Executor] = None) -> None:
+    """Run a `BoggleServer` until cancelled."""
+    server = await BoggleServer(dictionary, cubefile, executor).start(host, port)
+    async with server:
+        await server.serve_forever()
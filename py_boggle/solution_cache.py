@@ -0,0 +1,225 @@
+"""
+This module contains a cache of board solutions.
+
+Rotating or reflecting a board does not change which words it holds, so
+the cache keys each board by a canonical form shared by all 8 of its
+rotations and reflections. A cache belongs to one dictionary and one
+minimum word length; use a separate cache for each combination. On disk,
+give each combination its own `namespace`, such as the one returned by
+`dictionary_fingerprint`. A cache that `watch`es a dictionary drops the
+entries a word change could affect.
+"""
+
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+BoardKey = Tuple[str, ...]
+
+
+def _symmetries(size: int) -> List[List[int]]:
+    """Return the 8 cell permutations of a `size` x `size` board: for each
+    symmetry, the index of the original cell shown at each position.
+    """
+    def cell(r: int, c: int) -> int:
+        return r * size + c
+
+    last = size - 1
+    maps = [
+        lambda r, c: cell(r, c),
+        lambda r, c: cell(last - c, r),
+        lambda r, c: cell(last - r, last - c),
+        lambda r, c: cell(c, last - r),
+        lambda r, c: cell(r, last - c),
+        lambda r, c: cell(last - r, c),
+        lambda r, c: cell(c, r),
+        lambda r, c: cell(last - c, last - r),
+    ]
+    return [[source(r, c) for r in range(size) for c in range(size)] for source in maps]
+
+
+def dictionary_fingerprint(words_file: str, *options: object) -> str:
+    """Return a name identifying the dictionary loaded from `words_file`
+    with `options` (load options, minimum word length and so on).
+
+    The name changes whenever the file is replaced or edited, so solutions
+    found with an older copy of the file are not reused.
+    """
+    info = os.stat(words_file)
+    parts = [os.path.abspath(words_file), str(info.st_mtime_ns), str(info.st_size)]
+    parts += [repr(option) for option in options]
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:16]
+
+
+_SYMMETRY_CACHE = {}
+
+
+def canonical_board(board: Sequence[Sequence[str]]) -> BoardKey:
+    """Return the smallest of the row-major cell tuples of the 8 rotations
+    and reflections of `board`, lowercased.
+    """
+    size = len(board)
+    cells = [cell.lower() for row in board for cell in row]
+    if size not in _SYMMETRY_CACHE:
+        _SYMMETRY_CACHE[size] = _symmetries(size)
+    return min(tuple(cells[i] for i in order) for order in _SYMMETRY_CACHE[size])
+
+
+class SolutionCache:
+    """An LRU cache from boards to their word sets, with an optional
+    on-disk tier.
+
+    Entries are evicted least recently used first once there are more than
+    `max_entries` of them, or once their estimated size passes `max_bytes`.
+    With a `directory`, every stored solution is also written there, and
+    in-memory misses are looked up on disk before giving up. With a
+    `namespace` too, files go in that subdirectory of `directory`, so caches
+    for different dictionaries can share one directory.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None,
+                 directory: Optional[str] = None, namespace: str = ""):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.base_directory = directory # `directory` without the namespace
+        self.namespace = namespace
+        if directory and namespace:
+            directory = os.path.join(directory, namespace)
+        self.directory = directory
+        self.entries: "OrderedDict[BoardKey, FrozenSet[str]]" = OrderedDict()
+        self.bytes = 0 # estimated size of everything in `entries`
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.invalidated = 0 # entries dropped because the dictionary changed
+        self.watched: List[object] = [] # the dictionaries passed to `watch`
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, board: Sequence[Sequence[str]]) -> Optional[FrozenSet[str]]:
+        """Return the cached words for `board` or any of its rotations and
+        reflections, or None if there are none.
+        """
+        key = canonical_board(board)
+        words = self.entries.get(key)
+        if words is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return words
+        words = self._read(key)
+        if words is not None:
+            self.disk_hits += 1
+            self._remember(key, words)
+            return words
+        self.misses += 1
+        return None
+
+    def put(self, board: Sequence[Sequence[str]], words: Iterable[str]) -> FrozenSet[str]:
+        """Store the words of `board` and return them as a frozenset."""
+        key = canonical_board(board)
+        words = frozenset(words)
+        self._remember(key, words)
+        self._write(key, words)
+        return words
+
+    def sibling(self, name: str) -> "SolutionCache":
+        """Return an empty cache with the same limits, for another
+        dictionary, whose disk files go in a namespace derived from this
+        cache's namespace and `name`. The new cache watches the same
+        dictionaries as this one.
+        """
+        namespace = f"{self.namespace}.{name}" if self.namespace else name
+        cache = SolutionCache(self.max_entries, self.max_bytes, self.base_directory, namespace)
+        for dictionary in self.watched:
+            cache.watch(dictionary)
+        return cache
+
+    def watch(self, dictionary) -> None:
+        """Drop affected entries whenever `dictionary` adds or deletes a
+        word. The dictionary must provide `on_update`, as `TrieDictionary`
+        does.
+        """
+        dictionary.on_update(self.word_changed)
+        self.watched.append(dictionary)
+
+    def word_changed(self, word: str, added: bool) -> None:
+        """Drop every entry, in memory and on disk, that a change to `word`
+        could affect: boards holding it when it was deleted, and boards
+        with all of its letters when it was added.
+        """
+        word = word.lower()
+        letters = set(word)
+
+        def affected(key: BoardKey, words: FrozenSet[str]) -> bool:
+            if added:
+                return letters <= set("".join(key))
+            return word in words
+
+        for key in [key for key, words in self.entries.items() if affected(key, words)]:
+            self.bytes -= _estimate(key, self.entries.pop(key))
+            self.invalidated += 1
+        if not self.directory:
+            return
+        for name in os.listdir(self.directory):
+            if not name.endswith(".txt"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as infile:
+                    lines = infile.read().split("\n")
+            except OSError:
+                continue
+            key = tuple(lines[0].split("\x1f"))
+            if affected(key, frozenset(word for word in lines[1:] if word)):
+                os.remove(path)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry. The disk tier is left as it is."""
+        self.entries.clear()
+        self.bytes = 0
+
+    def _remember(self, key: BoardKey, words: FrozenSet[str]) -> None:
+        if key in self.entries:
+            self.bytes -= _estimate(key, self.entries.pop(key))
+        self.entries[key] = words
+        self.bytes += _estimate(key, words)
+        while self.entries and (len(self.entries) > self.max_entries or
+                                (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            old_key, old_words = self.entries.popitem(last=False)
+            self.bytes -= _estimate(old_key, old_words)
+
+    def _path(self, key: BoardKey) -> str:
+        digest = hashlib.sha1("\x1f".join(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest + ".txt")
+
+    def _read(self, key: BoardKey) -> Optional[FrozenSet[str]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key)) as infile:
+                lines = infile.read().split("\n")
+        except OSError:
+            return None
+        # the first line records the board, guarding against hash collisions
+        if lines[0] != "\x1f".join(key):
+            return None
+        return frozenset(word for word in lines[1:] if word)
+
+    def _write(self, key: BoardKey, words: FrozenSet[str]) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        partial = path + ".tmp"
+        with open(partial, "w") as outfile:
+            outfile.write("\n".join(["\x1f".join(key)] + sorted(words)) + "\n")
+        os.replace(partial, path)
+
+
+def _estimate(key: BoardKey, words: FrozenSet[str]) -> int:
+    return (sys.getsizeof(words) + sum(sys.getsizeof(word) for word in words)
+            + sys.getsizeof(key) + sum(sys.getsizeof(cell) for cell in key))
@@ -1,8 +1,10 @@
+import copy
+import threading
 import typing
-from typing import Optional, Dict
+from typing import Callable, Dict, List, Optional, Set
 from collections.abc import Iterator
 
-from py_boggle.boggle_dictionary import BoggleDictionary
+from py_boggle.boggle_dictionary import BoggleDictionary, letter_bit, read_words, walk_words
 
 
 class TrieNode:
@@ -13,6 +15,51 @@ class TrieNode:
     def __init__(self):
         self.children : Dict[str, TrieNode] = {} # maps a child letter to its TrieNode class
         self.is_word = False # whether or not this Node is a valid word ending
+        self.word_count = 0 # number of words ending at or below this node
+        self.height = 0 # letters in the longest word continuation below this node
+        self.below = 0 # letter_bit() of every letter in some word continuation below this node
+
+
+class SolveTracker:
+    """
+    Per-solve record of which trie words a board search has already found.
+
+    `remaining` maps a node to the number of words beneath it that have not
+    been found yet; nodes missing from the map still have all of their
+    `word_count` words left. A node whose count reaches zero is exhausted and
+    the search does not need to descend into it again. The map lives only as
+    long as the tracker, so the trie itself is never modified by a solve.
+    """
+    def __init__(self):
+        self.remaining : Dict[TrieNode, int] = {}
+        self.seen : Set[TrieNode] = set() # word-ending nodes already recorded
+
+    def exhausted(self, node: TrieNode) -> bool:
+        return self.remaining.get(node, node.word_count) == 0
+
+    def record(self, trail: List[TrieNode]) -> bool:
+        """
+        Record the word ending at `trail[-1]`, where `trail` lists the nodes
+        the search passed through to reach it.
+        Returns False if the word had already been recorded during this solve.
+        """
+        node = trail[-1]
+        if node in self.seen:
+            return False
+        self.seen.add(node)
+        remaining = self.remaining
+        for step in trail:
+            remaining[step] = remaining.get(step, step.word_count) - 1
+        return True
+
+
+class LookupStats:
+    """
+    Counts of dictionary lookups, filled in while stats are enabled on a TrieDictionary.
+    """
+    def __init__(self):
+        self.traversals = 0 # root-to-node walks by traverse(), is_prefix() and contains()
+        self.advances = 0 # cursor steps by advance()
 
 
 class TrieDictionary(BoggleDictionary):
@@ -22,30 +69,226 @@ class TrieDictionary(BoggleDictionary):
     Do NOT change the name of self.root, as our autograder will manually traverse using self.root
     """
 
+    node_class = TrieNode # type of every node in the trie
+
     def __init__(self):
-        self.root : TrieNode = TrieNode()
+        self.root : TrieNode = self.node_class()
+        self.stats : Optional[LookupStats] = None # lookup counters, while enabled
+        self.version = 0 # number of `insert` and `delete` calls that changed the words
+        self.update_hooks : List[Callable[[str, bool], None]] = [] # called with (word, added) after each change
+        self.update_lock = threading.Lock() # serializes `insert` and `delete`
 
-    def load_dictionary(self, filename: str) -> None:
+    def enable_stats(self) -> LookupStats:
+        """
+        Start counting lookups on this dictionary and return the counters.
+        Counting wraps `traverse` and `advance` on this instance only, so a
+        dictionary that never enables stats pays nothing for them.
+        """
+        self.disable_stats()
+        stats = LookupStats()
+        traverse = self.traverse
+        advance = self.advance
+
+        def counting_traverse(prefix: str) -> Optional[TrieNode]:
+            stats.traversals += 1
+            return traverse(prefix)
+
+        def counting_advance(cursor: TrieNode, letters: str) -> Optional[TrieNode]:
+            stats.advances += 1
+            return advance(cursor, letters)
+
+        self.traverse = counting_traverse
+        self.advance = counting_advance
+        self.stats = stats
+        return stats
+
+    def disable_stats(self) -> None:
+        """Stop counting lookups. The last counters stay readable."""
+        self.__dict__.pop("traverse", None)
+        self.__dict__.pop("advance", None)
+
+    def load_dictionary(self, filename: str, min_length: int = 0,
+                        alphabet: Optional[str] = None) -> None:
         # Remember to add every word to the trie, not just the words over some length.
-        with open(filename) as wordsfile:
-            for line in wordsfile:
-                word = line.strip().lower()
-                node = self.root
-                for letter in word:
-                    if letter not in node.children:
-                        node.children[letter] = TrieNode()
-                    node = node.children[letter]
-                node.is_word = True
-                # Do something with word here
-        # raise NotImplementedError("method load_dictionary") # TODO: implement your code here
-
-    def _insert(self, word: str) -> None:
+        self.build(read_words(filename, min_length, alphabet))
+
+    def build(self, words: List[str]) -> None:
+        """
+        Add every word in `words` to the trie.
+        Ascending input is added to an empty trie in one pass that reuses the
+        path of the previous word; anything else is inserted word by word.
+        """
+        if self.root.children or self.root.is_word or \
+                any(words[i] > words[i + 1] for i in range(len(words) - 1)):
+            for word in words:
+                self._insert(word)
+            return
+
+        node_class = self.node_class
+        path = [self.root] # nodes spelling the previous word, path[d] at depth d
+        letters : List[str] = [] # letters[d] leads from path[d] to path[d + 1]
+        previous = ""
+
+        def fold(depth: int) -> None:
+            # `path` nodes below `depth` are complete; add them to their parents
+            while len(path) > depth + 1:
+                child = path.pop()
+                parent = path[-1]
+                parent.word_count += child.word_count
+                if parent.height <= child.height:
+                    parent.height = child.height + 1
+                parent.below |= child.below | letter_bit(letters.pop())
+
+        for word in words:
+            if word == previous:
+                continue
+            common = 0
+            limit = min(len(word), len(previous))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            fold(common)
+            # sorted input never revisits a branch, so the rest of the
+            # word is all new nodes
+            node = path[-1]
+            for letter in word[common:]:
+                child = node_class()
+                node.children[letter] = child
+                path.append(child)
+                letters.append(letter)
+                node = child
+            node.is_word = True
+            node.word_count += 1
+            previous = word
+        fold(0)
+
+    def _insert(self, word: str) -> List[TrieNode]:
+        """
+        Add `word` and return the nodes spelling it, root first.
+        """
         node = self.root
+        path = [node]
         for letter in word:
             if letter not in node.children:
-                node.children[letter] = TrieNode()
+                node.children[letter] = self.node_class()
             node = node.children[letter]
-        node.is_word = True
+            path.append(node)
+        if not node.is_word:
+            node.is_word = True
+            self._count_added(path, word)
+        return path
+
+    def _count_added(self, path: List[TrieNode], word: str) -> None:
+        # update the summaries on `path` for `word`, which now ends at path[-1]
+        below = 0
+        for depth in range(len(word), -1, -1):
+            step = path[depth]
+            step.word_count += 1
+            if step.height < len(word) - depth:
+                step.height = len(word) - depth
+            step.below |= below
+            if depth:
+                below |= letter_bit(word[depth - 1])
+
+    def _count_removed(self, path: List[TrieNode], word: str) -> None:
+        # update the summaries on `path` for `word`, which no longer ends at
+        # path[-1], dropping nodes left without words
+        for depth in range(len(word), -1, -1):
+            step = path[depth]
+            step.word_count -= 1
+            if depth and not step.word_count:
+                del path[depth - 1].children[word[depth - 1]]
+                continue
+            step.height = 0
+            step.below = 0
+            for letter, child in step.children.items():
+                if step.height <= child.height:
+                    step.height = child.height + 1
+                step.below |= child.below | letter_bit(letter)
+
+    def insert(self, word: str) -> bool:
+        """
+        Add `word` while the dictionary is in use.
+        Nodes are never changed in place: the nodes on the word's path are
+        copied and a new root is swapped in, so searches already under way,
+        and snapshots, keep seeing the words as they were.
+        Update hooks run after the change, outside the update lock, so they
+        may change the dictionary themselves.
+        Returns False if `word` is empty or already present.
+        """
+        word = word.lower()
+        with self.update_lock:
+            node = self.traverse(word)
+            if not word or (node is not None and node.is_word):
+                return False
+            path = self._copy_path(word)
+            path[-1].is_word = True
+            self._count_added(path, word)
+            self._publish(path[0])
+        self._notify(word, True)
+        return True
+
+    def delete(self, word: str) -> bool:
+        """
+        Remove `word` while the dictionary is in use, dropping branches
+        left without words. Like `insert`, this copies the word's path.
+        Returns False if `word` is not present.
+        """
+        word = word.lower()
+        with self.update_lock:
+            node = self.traverse(word)
+            if not word or node is None or not node.is_word:
+                return False
+            path = self._copy_path(word)
+            path[-1].is_word = False
+            self._count_removed(path, word)
+            self._publish(path[0])
+        self._notify(word, False)
+        return True
+
+    def _copy_path(self, word: str) -> List[TrieNode]:
+        # copies of the root and of the nodes spelling `word`, creating any
+        # that are missing; the copies are linked to each other only
+        node = copy.copy(self.root)
+        node.children = dict(node.children)
+        path = [node]
+        for letter in word:
+            child = node.children.get(letter)
+            if child is None:
+                child = self.node_class()
+            else:
+                child = copy.copy(child)
+                child.children = dict(child.children)
+            node.children[letter] = child
+            node = child
+            path.append(node)
+        return path
+
+    def _publish(self, root: TrieNode) -> None:
+        self.root = root
+        self.version += 1
+
+    def _notify(self, word: str, added: bool) -> None:
+        for hook in list(self.update_hooks):
+            hook(word, added)
+
+    def on_update(self, hook: Callable[[str, bool], None]) -> None:
+        """
+        Call `hook(word, added)` after every `insert` and `delete` that
+        changes the words, e.g. to drop cached solutions.
+        """
+        self.update_hooks.append(hook)
+
+    def snapshot(self) -> "TrieDictionary":
+        """
+        Return a dictionary fixed at the current words and `version`.
+        It shares every node with this one and is unaffected by later
+        changes to either dictionary.
+        """
+        pinned = copy.copy(self)
+        pinned.disable_stats() # the counting wrappers would look up this dictionary's root
+        pinned.update_hooks = []
+        pinned.update_lock = threading.Lock()
+        return pinned
 
     def traverse(self, prefix: str) -> Optional[TrieNode]:
         """
@@ -74,17 +317,42 @@ class TrieDictionary(BoggleDictionary):
 
        # raise NotImplementedError("method contains") # TODO: implement your code here
 
-    def __iter__(self) -> typing.Iterator[str]:
-        words = []
+    def cursor(self) -> TrieNode:
+        return self.root
 
-        def dfs(node, current_word):
-            if node.is_word:
-                words.append(current_word)
-            for letter, child_node in node.children.items():
-                dfs(child_node, current_word + letter)
+    def advance(self, cursor: TrieNode, letters: str) -> Optional[TrieNode]:
+        if len(letters) == 1:
+            return cursor.children.get(letters)
+        for letter in letters:
+            cursor = cursor.children.get(letter)
+            if cursor is None:
+                return None
+        return cursor
 
-        dfs(self.root, "")
-        return iter(words)
+    def at_word(self, cursor: TrieNode) -> bool:
+        return cursor.is_word
 
-       # raise NotImplementedError("method __iter__") # TODO: implement your code here
+    def height(self, cursor: TrieNode) -> int:
+        return cursor.height
+
+    def letters_below(self, cursor: TrieNode) -> int:
+        return cursor.below
+
+    def solve_tracker(self) -> SolveTracker:
+        return SolveTracker()
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return walk_words(self, self.root, [])
+
+    def children(self, cursor: TrieNode) -> typing.Iterator[typing.Tuple[str, TrieNode]]:
+        return iter(sorted(cursor.children.items()))
+
+    def iter_prefix(self, prefix: str) -> typing.Iterator[str]:
+        prefix = prefix.lower()
+        node = self.traverse(prefix)
+        if node is None:
+            return iter(())
+        return walk_words(self, node, list(prefix))
 
+    def iter_range(self, lo: str = "", hi: Optional[str] = None) -> typing.Iterator[str]:
+        return walk_words(self, self.root, [], lo.lower(), None if hi is None else hi.lower())
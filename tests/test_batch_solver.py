@@ -0,0 +1,44 @@
+import pytest
+from py_boggle import batch_solver
+from py_boggle.trie_dictionary import TrieDictionary
+from py_boggle.my_game_manager import MyGameManager
+
+
+WORDS_FILE = "words.txt"
+CUBE_FILE = "cubes.txt"
+BOARDS = ["eecaalephnboqtty", "", "zzzzzzzzz", "catsdogs" + "rateline", "qu i e t e t x z p i z z z z z z"]
+
+
+def test_batch_matches_board_search():
+    """Tests that batch solving returns each board's words, in input order
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, game_dict)
+
+    results = list(batch_solver.solve_boards(BOARDS, WORDS_FILE, workers=2, chunksize=1))
+
+    assert [board for board, _ in results] == [b for b in BOARDS if b]
+    for board, words in results:
+        game.set_game(batch_solver.parse_board(board))
+        assert words == sorted(game.board_driven_search())
+
+
+def test_batch_rejects_non_square_board():
+    """Tests that a board that is not square is reported
+    """
+    with pytest.raises(ValueError):
+        list(batch_solver.solve_boards(["abc"], WORDS_FILE, workers=1))
+
+
+def test_worker_pool_uses_load_options():
+    """Tests that pool workers load the words with the given options
+    """
+    board = batch_solver.parse_board(BOARDS[0])
+    game_dict = batch_solver.load_dictionary(WORDS_FILE, 6, "abcdefghijklmnop")
+    expected = batch_solver.solve_board_paths(board, game_dict)
+    assert expected and all(len(word) >= 6 for word in expected)
+
+    with batch_solver.worker_pool(WORDS_FILE, 2, 6, "abcdefghijklmnop") as pool:
+        assert pool.submit(batch_solver.solve_board_paths_in_worker, board).result() == expected
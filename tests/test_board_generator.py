@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from py_boggle.board_generator import BoardGenerator, letter_counts, vowel_counts
+from py_boggle.board_solver import BoardSolver
+from py_boggle.my_game_manager import SHORT, load_cubes
+from py_boggle.trie_dictionary import TrieDictionary
+
+
+CUBE_FILE = "cubes.txt"
+WORDS_FILE = "words.txt"
+
+
+def test_batches_are_seeded_and_valid():
+    """Tests that boards are reproducible and show faces from the cube set
+    """
+    first = BoardGenerator(CUBE_FILE, seed=7).generate(4, 200)
+    second = BoardGenerator(CUBE_FILE, seed=7).generate(4, 200)
+    assert first.shape == (200, 4, 4)
+    assert (first == second).all()
+
+    cubes = load_cubes(CUBE_FILE)
+    faces = {face for cube in cubes for face in cube}
+    assert set(first.ravel()) <= faces
+
+    with pytest.raises(ValueError):
+        BoardGenerator(CUBE_FILE).generate(5, 1)
+
+
+def test_bulk_statistics():
+    """Tests letter and vowel counts over a batch
+    """
+    boards = np.array([[["a", "b"], ["a", "e"]], [["z", "z"], ["q", "u"]]])
+    counts = letter_counts(boards)
+    assert counts.shape == (2, 26)
+    assert counts[0, 0] == 2 and counts[1, 25] == 2
+    assert list(vowel_counts(boards)) == [3, 1]
+
+
+def test_targeted_boards_meet_constraints():
+    """Tests that targeted generation returns boards meeting the constraints
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    generator = BoardGenerator(CUBE_FILE, seed=3)
+
+    board = generator.generate_targeted(4, game_dict, min_score=300, min_longest=7)
+    words = BoardSolver(board, game_dict).solve(SHORT + 1)
+    assert sum(len(w) - SHORT for w in words) >= 300
+    assert max(map(len, words)) >= 7
+
+    board = generator.generate_targeted(4, game_dict, max_words=3)
+    assert len(BoardSolver(board, game_dict).solve(SHORT + 1)) <= 3
+
+    assert generator.generate_targeted(4, game_dict, min_words=10 ** 6, rounds=1, batch=2, steps=5) is None
@@ -4,7 +4,7 @@ import string
 from typing import List, Optional, Set, Tuple
 
 import pytest
-from py_boggle import trie_dictionary
+from py_boggle import boggle_dictionary, dawg_dictionary, trie_dictionary
 
 
 # read words file
@@ -114,3 +114,157 @@ def test_root():
     assert children_keys == alphabet or children_keys == ALPHABET
     
 
+def test_cursor_walk():
+    """Tests that advancing a cursor tile by tile agrees with traverse()
+    """
+    game_dict = trie_dictionary.TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+
+    node = game_dict.cursor()
+    for letter in "pota":
+        node = game_dict.advance(node, letter)
+    assert node is game_dict.traverse("pota")
+    assert not game_dict.at_word(node)
+
+    node = game_dict.advance(node, "to")
+    assert game_dict.at_word(node)
+    assert game_dict.advance(node, "zz") is None
+
+
+def test_dawg_matches_trie():
+    """Tests that the DAWG dictionary answers like the trie dictionary
+    """
+    trie = trie_dictionary.TrieDictionary()
+    trie.load_dictionary(WORDS_FILE)
+    dawg = dawg_dictionary.DawgDictionary()
+    dawg.load_dictionary(WORDS_FILE)
+
+    assert list(dawg) == list(trie)
+    for s in ["POTATO", "potat", "aardvark", "asdfkljsakldfj", ""]:
+        assert dawg.contains(s) == trie.contains(s)
+        assert dawg.is_prefix(s) == trie.is_prefix(s)
+
+    # shared suffixes are stored once
+    assert len(dawg.terminal) < len(words)
+
+
+def test_dawg_unsorted_and_empty():
+    """Tests that the DAWG builds from unsorted input and iterates when empty
+    """
+    dawg = dawg_dictionary.DawgDictionary()
+    assert list(dawg) == []
+
+    dawg.build(["tops", "stop", "top", "pots", "top"])
+    assert list(dawg) == ["pots", "stop", "top", "tops"]
+    assert not dawg.contains("to")
+
+
+def test_compiled_dictionary(tmp_path):
+    """Tests that a saved DAWG loads back memory-mapped with the same words
+    """
+    dawg = dawg_dictionary.DawgDictionary()
+    dawg.load_dictionary(WORDS_FILE)
+    compiled = str(tmp_path / "words.dawg")
+    dawg.save(compiled)
+
+    assert dawg_dictionary.is_compiled(compiled)
+    assert not dawg_dictionary.is_compiled(WORDS_FILE)
+
+    mapped = dawg_dictionary.DawgDictionary()
+    mapped.load_dictionary(compiled)
+    assert list(mapped) == list(dawg)
+    assert mapped.contains("POTATO") and not mapped.contains("potat")
+    assert mapped.is_prefix("potat")
+
+
+def test_iter_prefix_and_range():
+    """Tests prefix- and range-bounded iteration
+    """
+    game_dict = trie_dictionary.TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+
+    expected = sorted(s.lower() for s in words if s.startswith("QUA"))
+    assert list(game_dict.iter_prefix("Qua")) == expected
+    assert list(game_dict.iter_prefix("qzx")) == []
+
+    expected = sorted(s.lower() for s in words if "aah" <= s.lower() < "aals")
+    assert list(game_dict.iter_range("aah", "aals")) == expected
+    assert list(game_dict.iter_range("zymurgies")) == ["zymurgies", "zymurgy"]
+    assert list(game_dict.iter_range("b", "b")) == []
+
+
+def test_bulk_load_matches_insert(tmp_path, monkeypatch):
+    """Tests that loading a sorted file builds the same trie as inserting
+    the words one at a time, and that load options skip words
+    """
+    loaded = trie_dictionary.TrieDictionary()
+    loaded.load_dictionary(WORDS_FILE)
+    inserted = trie_dictionary.TrieDictionary()
+    shuffled = sorted(s.lower() for s in words)
+    random.seed(5)
+    random.shuffle(shuffled)
+    inserted.build(shuffled)
+
+    stack = [(loaded.root, inserted.root)]
+    while stack:
+        a, b = stack.pop()
+        assert (a.is_word, a.word_count, a.height, a.below) == (b.is_word, b.word_count, b.height, b.below)
+        assert a.children.keys() == b.children.keys()
+        stack.extend((a.children[c], b.children[c]) for c in a.children)
+
+    messy = tmp_path / "messy.txt"
+    messy.write_text("  Cat\n\ncats \nDOG\ndogs\nqi\nzebra")
+    # chunks that end mid-word must not split it
+    monkeypatch.setattr(boggle_dictionary, "_READ_CHUNK", 4)
+    for kind in (trie_dictionary.TrieDictionary, dawg_dictionary.DawgDictionary):
+        game_dict = kind()
+        game_dict.load_dictionary(str(messy))
+        assert list(game_dict) == ["cat", "cats", "dog", "dogs", "qi", "zebra"]
+        game_dict = kind()
+        game_dict.load_dictionary(str(messy), min_length=4, alphabet="ACDGOST")
+        assert list(game_dict) == ["cats", "dogs"]
+
+
+def test_live_insert_delete_and_snapshot():
+    """Tests that runtime changes keep the trie consistent and leave
+    snapshots untouched
+    """
+    game_dict = trie_dictionary.TrieDictionary()
+    game_dict.build(["cat", "cats", "dog"])
+    changes = []
+    game_dict.on_update(lambda word, added: changes.append((word, added)))
+    before = game_dict.snapshot()
+
+    assert game_dict.insert("Zebra") and not game_dict.insert("zebra")
+    assert game_dict.delete("cats") and not game_dict.delete("cats")
+    assert game_dict.delete("dog") and not game_dict.delete("do")
+    assert not game_dict.insert("")
+    assert changes == [("zebra", True), ("cats", False), ("dog", False)]
+    assert game_dict.version == 3 and before.version == 0
+
+    assert list(game_dict) == ["cat", "zebra"]
+    assert not game_dict.is_prefix("d")
+    assert list(before) == ["cat", "cats", "dog"]
+    assert before.contains("dog") and not before.contains("zebra")
+
+    expected = trie_dictionary.TrieDictionary()
+    expected.build(["cat", "zebra"])
+    stack = [(game_dict.root, expected.root)]
+    while stack:
+        a, b = stack.pop()
+        assert (a.is_word, a.word_count, a.height, a.below) == (b.is_word, b.word_count, b.height, b.below)
+        assert a.children.keys() == b.children.keys()
+        stack.extend((a.children[c], b.children[c]) for c in a.children)
+
+
+def test_update_hook_can_change_words():
+    """Tests that an update hook may itself insert or delete words
+    """
+    game_dict = trie_dictionary.TrieDictionary()
+    game_dict.build(["cat", "dog"])
+    banned = {"darn"}
+    game_dict.on_update(lambda word, added: added and word in banned and game_dict.delete(word))
+
+    assert game_dict.insert("darn")
+    assert list(game_dict) == ["cat", "dog"]
+    assert game_dict.version == 2
@@ -0,0 +1,46 @@
+import pytest
+from py_boggle.game_session import GameSession
+from py_boggle.trie_dictionary import TrieDictionary
+
+
+WORDS_FILE = "words.txt"
+CUBE_FILE = "cubes.txt"
+
+example_board = [
+    ["E", "E", "C", "A"],
+    ["A", "L", "E", "P"],
+    ["H", "N", "B", "O"],
+    ["Q", "T", "T", "Y"],
+]
+
+
+def test_shared_board_and_unique_scoring():
+    """Tests per-player scores and cancellation of words found by several players
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+
+    session = GameSession()
+    session.new_game(4, CUBE_FILE, game_dict)
+    session.set_game(example_board)
+    for name in ("ann", "bob", "cy"):
+        session.add_player(name)
+
+    assert session.add_word("ann", "blah") == 1
+    assert session.add_word("ann", "blah") == 0
+    assert session.add_word("ann", "capelan") == 4
+    assert session.add_word("bob", "BLAH") == 1
+    assert session.add_word("cy", "blah") == 1
+    assert session.add_word("bob", "pope") == 0
+    assert session.add_word("cy", "toecap") == 3
+
+    assert [session.get_score(n) for n in ("ann", "bob", "cy")] == [5, 1, 4]
+    assert [session.get_unique_score(n) for n in ("ann", "bob", "cy")] == [4, 0, 3]
+    assert session.get_last_added_word("bob") == [(2, 2), (1, 1), (1, 0), (2, 0)]
+    assert "capelan" in session.all_words()
+
+    with pytest.raises(KeyError):
+        session.add_word("dee", "blah")
+
+    session.set_game(example_board)
+    assert session.get_score("ann") == 0 and session.players["ann"].words == []
@@ -7,7 +7,9 @@ import pytest
 from py_boggle.boggle_dictionary import BoggleDictionary
 from py_boggle.trie_dictionary import TrieDictionary
 from py_boggle.boggle_game import BoggleGame
-from py_boggle.my_game_manager import MyGameManager
+from py_boggle.board_solver import BoardSolution, BoardSolver, SearchBudget, neighbor_table
+from py_boggle.my_game_manager import MyGameManager, load_cubes
+from py_boggle.solution_cache import SolutionCache
 
 
 # read words file
@@ -135,3 +137,314 @@ def test_non_4x4_board():
         assert result[0], comment
 
 
+
+
+def test_neighbor_table():
+    """Tests the precomputed adjacency used by both searches
+    """
+    table = neighbor_table(4)
+
+    assert len(table) == 16
+    assert table[0] == (1, 4, 5)
+    assert len(table[5]) == 8
+    assert all(cell not in table[cell] for cell in range(16))
+    assert neighbor_table(4) is table
+
+
+def test_pruned_board_search():
+    """Tests that pruning exhausted trie subtrees finds the same words
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+
+    game = MyGameManager()
+    game.new_game(len(example_board), CUBE_FILE, game_dict)
+    game.set_game(example_board)
+    game.prune_found = True
+
+    result = _check_all_words(game, example_words, "board")
+    assert result[0], f"Your pruned board search {result[1]} when using our game board"
+
+
+def test_search_strategies_agree():
+    """Tests that both searches find the same words on random boards
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+
+    game = MyGameManager()
+    random.seed(2024)
+    for _ in range(5):
+        game.new_game(4, CUBE_FILE, game_dict)
+        assert game.board_driven_search() == game.dictionary_driven_search()
+
+
+def test_search_stats():
+    """Tests the counters recorded by an instrumented board search
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    lookups = game_dict.enable_stats()
+
+    game = MyGameManager()
+    game.new_game(len(example_board), CUBE_FILE, game_dict)
+    game.set_game(example_board)
+    assert game.board_driven_search() == {w.lower() for w in example_words}
+    assert game.last_stats is None
+
+    game.collect_stats = True
+    assert game.board_driven_search() == {w.lower() for w in example_words}
+    stats = game.last_stats
+    assert stats.words_found == len(example_words)
+    assert stats.trie_lookups == stats.nodes_visited + stats.prefix_rejections
+    assert stats.max_depth >= len("capelan")
+    assert len(stats.cell_seconds) == 16
+    assert lookups.advances >= 2 * stats.trie_lookups
+
+    game_dict.disable_stats()
+    game_dict.contains("blah")
+    assert lookups.traversals == 0
+
+
+def test_indexed_add_word():
+    """Tests that an indexed game scores guesses like an unindexed one
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+
+    plain = MyGameManager()
+    indexed = MyGameManager()
+    indexed.index_words = True
+    for game in (plain, indexed):
+        game.new_game(len(example_board), CUBE_FILE, game_dict)
+        game.set_game(example_board)
+
+    # the board given by new_game is replaced before it is ever solved
+    assert indexed.word_paths is None
+    assert set(indexed.word_path_index()) == {w.lower() for w in example_words}
+    for guess in ["blah", "BLAH", "pope", "asdf", "cape", "toecap", "o", "capelan"]:
+        assert indexed.add_word(guess) == plain.add_word(guess)
+        assert indexed.get_last_added_word() == plain.get_last_added_word()
+        assert indexed.get_score() == plain.get_score()
+    assert indexed.get_score() == 1 + 1 + 3 + 4
+
+
+def test_add_words_batch():
+    """Tests that a batch of guesses scores like one guess at a time
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    guesses = ["blah", "BLAH", "pope", "cape", "o", "toecap", "asdf", "capelan"]
+
+    single = MyGameManager()
+    single.new_game(len(example_board), CUBE_FILE, game_dict)
+    single.set_game(example_board)
+    expected = [(g.lower(), single.add_word(g)) for g in guesses]
+
+    batch = MyGameManager()
+    batch.new_game(len(example_board), CUBE_FILE, game_dict)
+    batch.add_word("quit")
+    results = batch.replay(example_board, guesses)
+
+    assert results == expected
+    assert batch.get_score() == single.get_score()
+    assert batch.words == single.words
+    assert batch.get_last_added_word() == single.get_last_added_word()
+
+
+def test_board_solution_change_cell():
+    """Tests that changing one cell updates the solution like a full re-solve
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    board = [[c.lower() for c in row] for row in example_board]
+    solution = BoardSolution(board, game_dict, 4)
+    assert solution.words() == {w.lower() for w in example_words}
+
+    random.seed(99)
+    for _ in range(20):
+        before = solution.words()
+        masks = {word: set(word_masks) for word, word_masks in solution.masks.items()}
+        by_cell = [set(words) for words in solution.by_cell]
+        board = solution.board()
+        gained, lost = solution.change_cell(random.randrange(16), random.choice("aeilnrst"))
+        expected = BoardSolver(solution.board(), game_dict).solve(4)
+        assert solution.words() == expected
+        assert gained == expected - before and lost == before - expected
+        if random.random() < 0.5:
+            solution.undo_change()
+            assert solution.board() == board and solution.masks == masks
+            assert solution.by_cell == by_cell
+            with pytest.raises(ValueError):
+                solution.undo_change()
+
+
+def test_change_cell():
+    """Tests that changing cells in a game keeps its words and paths current
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    game = MyGameManager()
+    game.index_words = True
+    game.new_game(len(example_board), CUBE_FILE, game_dict)
+    game.set_game(example_board)
+
+    game.word_path_index()
+
+    random.seed(7)
+    for _ in range(20):
+        row, col = random.randrange(4), random.randrange(4)
+        found = game.change_cell(row, col, random.choice("AEILNRST"))
+        expected = BoardSolver(game.get_board(), game_dict).solve(4)
+        assert found == expected == set(game.word_paths)
+        assert game.board_driven_search() == expected
+        for word, path in game.word_paths.items():
+            assert "".join(game.get_board()[r][c] for r, c in game.solver.coords(path)) == word
+
+
+def test_solve_bounded():
+    """Tests that a budgeted search finds the full solution given enough
+    budget, and a subset of it otherwise
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    random.seed(12)
+    board = [[random.choice("aeilnorst") for _ in range(10)] for _ in range(10)]
+    solver = BoardSolver(board, game_dict)
+    expected = solver.solve(4)
+
+    budget = SearchBudget()
+    assert solver.solve_bounded(4, budget=budget) == expected
+    assert budget.complete
+
+    budget.max_nodes = budget.nodes // 3
+    partial = solver.solve_bounded(4, budget=budget)
+    assert not budget.complete and budget.nodes == budget.max_nodes
+    assert partial < expected
+
+    assert solver.solve_bounded(4, max_length=5) == {w for w in expected if len(w) <= 5}
+
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, game_dict)
+    game.set_game(board)
+    game.search_budget = SearchBudget(max_seconds=60)
+    assert game.board_driven_search() == expected
+
+    # a budgeted game reuses the cached solution of a board it has seen
+    game.solution_cache = SolutionCache()
+    assert game.board_driven_search() == expected
+    game.search_budget.nodes = -1
+    game.search_budget.complete = False # as an earlier hint that ran out leaves it
+    assert game.board_driven_search() == expected
+    assert game.search_budget.complete
+    assert game.solution_cache.hits == 1 and game.search_budget.nodes == -1
+
+    longest = sorted(expected, key=lambda w: (-len(w), w))[:3]
+    assert game.hint(3) == longest and game.search_budget.complete
+    game.search_budget = SearchBudget(max_nodes=10)
+    assert len(game.hint(3)) <= 3 and not game.search_budget.complete
+
+
+@pytest.mark.parametrize("kind", ["trie", "dawg"])
+def test_multi_letter_tiles(kind, tmp_path):
+    """Tests that a "qu" tile is searched as one cell in every strategy
+    """
+    from py_boggle.dawg_dictionary import DawgDictionary
+    game_dict = TrieDictionary() if kind == "trie" else DawgDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    board = [["qu", "i", "e", "t"],
+             ["e", "t", "x", "z"],
+             ["p", "i", "z", "z"],
+             ["z", "z", "z", "z"]]
+
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, game_dict)
+    game.set_game(board)
+    expected = {"quiet", "quit", "quite"}
+    found = game.board_driven_search()
+    assert expected <= found
+    assert found == game.dictionary_driven_search()
+    assert all(not word.startswith("q") or word.startswith("qu") for word in found)
+    assert game.add_word("quiet") == 2
+    assert game.get_last_added_word() == [(0, 0), (0, 1), (0, 2), (0, 3)]
+    assert game.add_word("qiet") == 0
+
+    cube_file = tmp_path / "cubes.txt"
+    cube_file.write_text("A B C D E Qu\nabcdef\nfoo\n" * 8)
+    cubes = load_cubes(str(cube_file))
+    assert cubes[0] == ("a", "b", "c", "d", "e", "qu") and cubes[1] == tuple("abcdef")
+    assert len(cubes) == 16
+    game.new_game(4, str(cube_file), game_dict)
+    assert {label for row in game.get_board() for label in row} <= {"a", "b", "c", "d", "e", "f", "qu"}
+
+
+def test_all_paths_and_counts():
+    """Tests that every distinct path of every word is collected in one search
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    board = [["s", "e", "e", "s"],
+             ["e", "e", "s", "e"],
+             ["s", "e", "e", "s"],
+             ["t", "e", "e", "t"]]
+    solver = BoardSolver(board, game_dict)
+    all_paths = solver.solve_all_paths(4)
+    counts = solver.solve_path_counts(4)
+    assert set(all_paths) == set(counts) == solver.solve(4)
+
+    def brute_count(word: str, cell: int, index: int, visited: int) -> int:
+        if solver.cells[cell] != word[index]:
+            return 0
+        if index == len(word) - 1:
+            return 1
+        visited |= 1 << cell
+        return sum(brute_count(word, nxt, index + 1, visited)
+                   for nxt in solver.neighbors[cell] if not visited >> nxt & 1)
+
+    for word, packed_paths in all_paths.items():
+        assert counts[word] == len(packed_paths) == len(set(packed_paths))
+        assert counts[word] == sum(brute_count(word, cell, 0, 0) for cell in range(16))
+        for packed in packed_paths:
+            assert "".join(solver.cells[c] for c in solver.decode_path(packed)) == word
+        assert [bytes(path) for path in solver.find_all_paths(word)] == packed_paths
+    assert counts["sees"] > 1
+
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, game_dict)
+    game.set_game(board)
+    assert game.word_path_counts() == dict(counts)
+    assert len(game.all_word_paths("SEES")) == counts["sees"]
+    assert game.all_word_paths("asdf") == []
+
+    wide = BoardSolver([["a"] * 17 for _ in range(17)], game_dict)
+    assert wide.path_width() == 2
+    assert wide.decode_path(bytes([32, 1, 5, 0])) == [288, 5]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_top_words_and_matching(seed):
+    """Tests bounded top-K, longest-word and pattern queries against a full solve
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    random.seed(seed)
+    board = [[random.choice("aeilnorstcdp") for _ in range(6)] for _ in range(6)]
+    solver = BoardSolver(board, game_dict)
+    every = sorted(solver.solve(4), key=lambda w: (-len(w), w))
+
+    for count in (1, 5, 20):
+        assert solver.top_words(count, 4) == every[:count]
+    assert solver.top_words(0) == []
+    assert solver.top_words(3, 4, exclude=every[:2]) == every[2:5]
+    assert solver.longest_word(4) == every[0]
+    assert BoardSolver([["z", "z"], ["z", "z"]], game_dict).longest_word(4) is None
+
+    for prefix, suffix in [("re", ""), ("", "ed"), ("s", "s"), ("qqq", "")]:
+        expected = {w for w in every if w.startswith(prefix) and w.endswith(suffix)}
+        assert solver.solve_matching(prefix, suffix, 4) == expected
+
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, game_dict)
+    game.set_game(board)
+    game.add_word(every[0])
+    assert game.hint(3) == every[1:4]
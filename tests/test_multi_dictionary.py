@@ -0,0 +1,153 @@
+import random
+
+import pytest
+from py_boggle.board_solver import BoardSolver
+from py_boggle.multi_dictionary import MultiDictionary
+from py_boggle.my_game_manager import MyGameManager
+from py_boggle.solution_cache import SolutionCache
+from py_boggle.trie_dictionary import TrieDictionary
+
+
+WORDS_FILE = "words.txt"
+CUBE_FILE = "cubes.txt"
+BOARD = [["e", "e", "c", "a"], ["a", "l", "e", "p"], ["h", "n", "b", "o"], ["q", "t", "t", "y"]]
+
+
+def _lists():
+    with open(WORDS_FILE) as infile:
+        full = [line.strip().lower() for line in infile]
+    random.seed(22)
+    family = [word for word in full if random.random() < 0.9]
+    regional = sorted(set(family) | {"zzyzx", "cela"})
+    return full, family, regional
+
+
+def test_lists_share_one_trie():
+    """Tests that each selected list answers like its own trie
+    """
+    full, family, regional = _lists()
+    shared = MultiDictionary()
+    shared.add_words("full", full)
+    shared.add_words("family", family)
+    shared.add_words("regional", regional)
+    with pytest.raises(ValueError):
+        shared.add_words("full", [])
+    with pytest.raises(KeyError):
+        shared.select("none")
+
+    own = TrieDictionary()
+    own.build(family)
+    view = shared.select("family")
+    assert list(view) == list(own)
+    assert list(view.iter_prefix("qua")) == list(own.iter_prefix("qua"))
+    assert list(shared) == sorted(set(full) | {"zzyzx", "cela"})
+    assert shared.lists_of("CELA") == ["regional"]
+    assert shared.lists_of("zzz") == []
+
+    solver = BoardSolver(BOARD, view)
+    assert solver.solve(4) == BoardSolver(BOARD, own).solve(4)
+    assert solver.solve_by_dictionary(4) == BoardSolver(BOARD, own).solve(4)
+
+    by_list = shared.split(BoardSolver(BOARD, shared).solve_lists(4))
+    assert by_list["family"] == BoardSolver(BOARD, own).solve(4)
+    assert by_list["regional"] == by_list["family"] | {"cela"}
+    assert by_list["full"] == BoardSolver(BOARD, shared.select("full")).solve(4)
+
+
+def test_live_updates_per_list():
+    """Tests that runtime changes go to one list, or to every list
+    """
+    shared = MultiDictionary()
+    shared.add_words("full", ["cat", "cats", "dog"])
+    shared.add_words("family", ["cat", "dog"])
+    family = shared.select("family")
+
+    assert shared.insert("cats", "family") and not shared.insert("cats", "family")
+    assert shared.lists_of("cats") == ["full", "family"]
+    assert shared.insert("Zebra")
+    assert shared.lists_of("zebra") == ["full", "family"]
+    assert shared.delete("dog", "family") and not shared.delete("dog", "family")
+    assert list(family) == ["cat", "cats", "zebra"]
+    assert shared.contains("dog") and not family.is_prefix("d")
+    assert shared.delete("dog")
+    assert not shared.is_prefix("d") and shared.lists_of("dog") == []
+    assert shared.delete("zebra", "full") and shared.delete("zebra", "family")
+    assert list(shared) == ["cat", "cats"]
+    assert shared.version == 6
+    with pytest.raises(KeyError):
+        shared.insert("emu", "none")
+
+
+def test_game_picks_a_list():
+    """Tests that a game plays with its chosen list
+    """
+    full, family, regional = _lists()
+    shared = MultiDictionary()
+    shared.add_words("full", full)
+    shared.add_words("regional", regional)
+
+    game = MyGameManager()
+    game.word_list = "regional"
+    game.new_game(4, CUBE_FILE, shared)
+    game.set_game(BOARD)
+    assert game.add_word("cela") == 1
+    assert "cela" in game.words_by_list()["regional"]
+    assert "cela" not in game.words_by_list()["full"]
+
+    game.solution_cache = SolutionCache()
+    regional_words = game.board_driven_search()
+    assert "cela" in regional_words
+
+    game.word_list = "full"
+    game.new_game(4, CUBE_FILE, game.dictionary)
+    game.set_game(BOARD)
+    assert game.add_word("cela") == 0
+    assert game.board_driven_search() == game.words_by_list()["full"]
+    assert "cela" not in game.board_driven_search()
+
+    game.word_list = "regional"
+    game.new_game(4, CUBE_FILE, game.dictionary)
+    game.set_game(BOARD)
+    assert game.board_driven_search() == regional_words
+    assert game.solution_cache.hits == 1
+
+
+def test_game_keeps_a_passed_view():
+    """Tests that a game given one list's view plays with that list
+    """
+    full, family, regional = _lists()
+    shared = MultiDictionary()
+    shared.add_words("family", family)
+    shared.add_words("regional", regional)
+
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, shared.select("family"))
+    game.set_game(BOARD)
+    assert game.word_list == "family"
+    assert game.dictionary.name == "family"
+    assert "cela" not in game.board_driven_search()
+    assert game.add_word("cela") == 0
+
+
+def test_list_cache_follows_word_changes():
+    """Tests that a word list's cache drops solutions when words change
+    """
+    full, family, regional = _lists()
+    shared = MultiDictionary()
+    shared.add_words("family", family)
+    shared.add_words("regional", regional)
+
+    game = MyGameManager()
+    game.solution_cache = SolutionCache()
+    game.solution_cache.watch(shared)
+    game.new_game(4, CUBE_FILE, shared)
+    game.word_list = "regional"
+    game.new_game(4, CUBE_FILE, shared)
+    game.set_game(BOARD)
+    assert "cela" in game.board_driven_search()
+
+    assert shared.delete("cela", "regional")
+    game.new_game(4, CUBE_FILE, shared)
+    game.set_game(BOARD)
+    assert "cela" not in game.board_driven_search()
+    assert game.solution_cache.hits == 0
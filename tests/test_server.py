@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor, Future
+
+from py_boggle.server import BoggleServer
+from py_boggle.trie_dictionary import TrieDictionary
+
+
+WORDS_FILE = "words.txt"
+CUBE_FILE = "cubes.txt"
+
+example_board = [
+    ["e", "e", "c", "a"],
+    ["a", "l", "e", "p"],
+    ["h", "n", "b", "o"],
+    ["q", "t", "t", "y"],
+]
+
+
+async def _request(reader, writer, **request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def _play(server):
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    other_reader, other_writer = await asyncio.open_connection("127.0.0.1", port)
+
+    replies = [
+        await _request(reader, writer, op="join", room="r", player="ann"),
+        await _request(other_reader, other_writer, op="join", room="r", player="bob"),
+        await _request(reader, writer, op="guess", room="r", player="ann", word="blah"),
+        await _request(reader, writer, op="new_game", room="r", board=example_board),
+        await _request(reader, writer, op="guess", room="r", player="ann", word="blah"),
+        await _request(other_reader, other_writer, op="guess", room="r", player="bob", word="capelan"),
+        await _request(other_reader, other_writer, op="guess", room="r", player="bob", word="blah"),
+        await _request(reader, writer, op="scores", room="r"),
+        await _request(reader, writer, op="new_game", room="s", size=3),
+        await _request(reader, writer, op="fly", room="r"),
+    ]
+    for w in (writer, other_writer):
+        w.close()
+        await w.wait_closed()
+    await asyncio.sleep(0.1)
+    listener.close()
+    await listener.wait_closed()
+    return replies
+
+
+def test_server_game():
+    """Tests a two-player game played through the server
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    server = BoggleServer(game_dict, CUBE_FILE)
+
+    joined, _, early, started, ann, bob, bob_again, scores, random_game, bad = asyncio.run(_play(server))
+
+    assert joined == {"ok": True, "board": None}
+    assert not early["ok"]
+    assert started["board"] == example_board
+    assert ann == {"ok": True, "points": 1, "score": 1, "path": [[2, 2], [1, 1], [1, 0], [2, 0]]}
+    assert bob["points"] == 4 and bob_again["score"] == 5
+    assert scores["scores"] == {"ann": [1, 0], "bob": [5, 4]}
+    assert len(random_game["board"]) == 3
+    assert not bad["ok"]
+
+
+class FailingExecutor(Executor):
+    """Fails every solve after a moment, as a broken process pool would."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        threading.Timer(0.2, future.set_exception, (MemoryError("board too big"),)).start()
+        return future
+
+
+async def _fail(server):
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    other_reader, other_writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def late_guess():
+        await asyncio.sleep(0.05)
+        return await _request(other_reader, other_writer, op="guess", room="r", player="bob", word="blah")
+
+    replies = list(await asyncio.gather(
+        _request(reader, writer, op="new_game", room="r", board=example_board),
+        late_guess(),
+    ))
+    replies += [
+        await _request(reader, writer, op="new_game", room="s", size=3),
+        await _request(reader, writer, op="scores", room="r"),
+    ]
+    for w in (writer, other_writer):
+        w.close()
+        await w.wait_closed()
+    await asyncio.sleep(0.1)
+    listener.close()
+    await listener.wait_closed()
+    return replies
+
+
+def test_server_reports_failed_games():
+    """Tests that a failed solve or cubes file gets an error reply and
+    leaves the room without a game
+    """
+    game_dict = TrieDictionary()
+    game_dict.build(["blah"])
+    server = BoggleServer(game_dict, "no-such-cubes.txt", FailingExecutor())
+
+    solve_failed, waiting_guess, no_cubes, scores = asyncio.run(_fail(server))
+
+    assert solve_failed == {"ok": False, "error": "MemoryError: board too big"}
+    assert waiting_guess == {"ok": False, "error": "no game in progress"}
+    assert not no_cubes["ok"] and no_cubes["error"].startswith("FileNotFoundError")
+    assert scores == {"ok": False, "error": "no game in progress"}
@@ -0,0 +1,134 @@
+from py_boggle.solution_cache import SolutionCache, canonical_board, dictionary_fingerprint
+from py_boggle.trie_dictionary import TrieDictionary
+from py_boggle.my_game_manager import MyGameManager
+
+
+WORDS_FILE = "words.txt"
+CUBE_FILE = "cubes.txt"
+
+board = [
+    ["e", "e", "c", "a"],
+    ["a", "l", "e", "p"],
+    ["h", "n", "b", "o"],
+    ["q", "t", "t", "y"],
+]
+
+
+def rotate(b):
+    return [list(row) for row in zip(*b[::-1])]
+
+
+def test_canonical_board_folds_symmetries():
+    """Tests that all rotations and reflections share one key
+    """
+    variants = [board]
+    for _ in range(3):
+        variants.append(rotate(variants[-1]))
+    variants += [[row[::-1] for row in v] for v in variants]
+
+    keys = {canonical_board(v) for v in variants}
+    assert len(keys) == 1
+
+    swapped = [list(row) for row in board]
+    swapped[0][0], swapped[3][3] = swapped[3][3], swapped[0][0]
+    assert canonical_board(swapped) not in keys
+
+
+def test_cache_serves_rotated_board():
+    """Tests that a rotated board is answered from the cache
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    game = MyGameManager()
+    game.new_game(4, CUBE_FILE, game_dict)
+    game.solution_cache = SolutionCache()
+
+    game.set_game(board)
+    words = game.board_driven_search()
+    game.set_game(rotate(board))
+    assert game.board_driven_search() == words
+    assert (game.solution_cache.hits, game.solution_cache.misses) == (1, 1)
+
+
+def test_cache_eviction_and_disk(tmp_path):
+    """Tests LRU eviction and the on-disk tier
+    """
+    cache = SolutionCache(max_entries=2, directory=str(tmp_path))
+    boards = [[["a", "b"], ["c", c]] for c in "xyz"]
+    for i, b in enumerate(boards):
+        cache.put(b, {f"word{i}"})
+
+    assert len(cache) == 2
+    assert canonical_board(boards[0]) not in cache.entries
+    assert cache.get(boards[0]) == {"word0"}
+    assert cache.disk_hits == 1
+
+    small = SolutionCache(max_bytes=1)
+    small.put(boards[0], {"word"})
+    assert len(small) == 0
+
+
+def test_cache_drops_entries_on_dictionary_change(tmp_path):
+    """Tests that a watching cache forgets boards a word change affects
+    """
+    game_dict = TrieDictionary()
+    game_dict.build(["cola", "coal", "tame"])
+    cache = SolutionCache(directory=str(tmp_path))
+    cache.watch(game_dict)
+    cola = [["c", "o"], ["l", "a"]]
+    team = [["t", "e"], ["a", "m"]]
+    cache.put(cola, ["cola", "coal"])
+    cache.put(team, ["tame"])
+
+    game_dict.insert("loca")
+    assert cache.get(cola) is None and cache.get(team) is not None
+    game_dict.delete("tame")
+    assert cache.get(team) is None
+    assert cache.invalidated == 2
+    assert not list(tmp_path.iterdir())
+
+
+def test_disk_cache_is_separate_per_dictionary(tmp_path):
+    """Tests that solutions found with one words file are not served for another
+    """
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("cola\n")
+    second.write_text("coal\n")
+    names = {dictionary_fingerprint(str(first), (0, None), 3),
+             dictionary_fingerprint(str(second), (0, None), 3),
+             dictionary_fingerprint(str(first), (4, "aclo"), 3)}
+    assert len(names) == 3
+
+    cola = [["c", "o"], ["l", "a"]]
+    directory = str(tmp_path / "cache")
+    SolutionCache(directory=directory, namespace=dictionary_fingerprint(str(first))).put(cola, ["cola"])
+    assert SolutionCache(directory=directory, namespace=dictionary_fingerprint(str(second))).get(cola) is None
+    assert SolutionCache(directory=directory, namespace=dictionary_fingerprint(str(first))).get(cola) == {"cola"}
+
+
+def test_solve_overlapping_a_word_change_is_not_cached():
+    """Tests that a solution found while the dictionary changed is not stored
+    """
+    game_dict = TrieDictionary()
+    game_dict.load_dictionary(WORDS_FILE)
+    cache = SolutionCache()
+    cache.watch(game_dict)
+    game = MyGameManager()
+    game.solution_cache = cache
+    game.new_game(4, CUBE_FILE, game_dict)
+    game.set_game(board)
+
+    solve = game.solver.solve
+
+    def solve_then_change(*args, **kwargs):
+        words = solve(*args, **kwargs)
+        game_dict.delete("bent")
+        return words
+
+    game.solver.solve = solve_then_change
+    assert "bent" in game.board_driven_search()
+    assert len(cache) == 0
+    game.solver.solve = solve
+    assert "bent" not in game.board_driven_search()
+    assert len(cache) == 1